@@ -1,31 +1,36 @@
 from __future__ import annotations
 
+from io import BytesIO
+
 from lxml import etree
 
 
 def extract_plain_text_from_akn(xml_bytes: bytes) -> str:
-	parser = etree.XMLParser(recover=True, resolve_entities=False, huge_tree=True)
-	root = etree.fromstring(xml_bytes, parser=parser)
-	nsmap = {k if k else "akn": v for k, v in (root.nsmap or {}).items()}
-	# Try common body containers in Akoma Ntoso
-	body_candidates = [
-		"//akn:body",
-		"//body",
-		"//akn:judgment/akn:body",
-		"//akn:act/akn:body",
-	]
+	# Stream the document, clearing each body once its text is taken, so large
+	# judgments never need a full in-memory tree. "{*}body" matches the body
+	# element under any AKN namespace version, or none.
+	context = etree.iterparse(
+		BytesIO(xml_bytes),
+		events=("end",),
+		tag="{*}body",
+		recover=True,
+		resolve_entities=False,
+		huge_tree=True,
+	)
 	text_parts: list[str] = []
-	for xpath in body_candidates:
-		nodes = root.xpath(xpath, namespaces=nsmap)
-		if not nodes:
-			continue
-		for node in nodes:
-			for p in node.xpath(".//text()", namespaces=nsmap):
-				val = (p or "").strip()
+	try:
+		for _, elem in context:
+			# A body nested in another body is read with its outer body
+			if next(elem.iterancestors("{*}body"), None) is not None:
+				continue
+			for t in elem.itertext():
+				val = t.strip()
 				if val:
 					text_parts.append(val)
-		if text_parts:
-			break
+			elem.clear(keep_tail=False)
+			while elem.getprevious() is not None:
+				del elem.getparent()[0]
+	except etree.XMLSyntaxError:
+		# Unrecoverable input; keep whatever was extracted before the error
+		pass
 	return "\n".join(text_parts)
-
-
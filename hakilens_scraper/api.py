@@ -1,22 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
+import json
+import re
+import time
+import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
 import traceback
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi import Body
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
+from starlette.concurrency import run_in_threadpool
 import google.generativeai as genai
 from .config import settings as _llm_settings
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from typing import List, Literal
 from datetime import datetime
 
 from .config import settings
-from .db import Case, Document, Image, get_session, init_db
+from sqlalchemy import bindparam, func, or_, select, text
+
+from .db import Case, Document, Image, Job, LLMCache, db_write_lock, fts_enabled, fts_query, get_session, init_db
 from .scraper import scrape_url, crawl_listing, scrape_case_detail, search_and_scrape
 
 
@@ -39,22 +52,53 @@ class ChatResponse(BaseModel):
 	parsing_instructions: str = "Render as markdown with syntax highlighting. Support tables, lists, headings, and code blocks."
 
 
-app = FastAPI(title="Hakilens Scraper API", version="0.1.0")
+async def parse_chat_request(request: Request) -> ChatRequest:
+	"""Validate the raw body in one pass with pydantic-core's JSON parser.
+
+	FastAPI's default body handling decodes to Python objects with ``json`` and
+	then validates them; ``model_validate_json`` skips that intermediate tree.
+	"""
+	try:
+		return ChatRequest.model_validate_json(await request.body())
+	except ValidationError as e:
+		raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)])
+
+
+def _inline_schema(model: type[BaseModel]) -> dict[str, Any]:
+	# Inline $defs so the schema can sit directly in openapi_extra
+	schema = model.model_json_schema()
+	defs = schema.pop("$defs", {})
+
+	def resolve(node):
+		if isinstance(node, dict):
+			ref = node.get("$ref", "")
+			if ref.startswith("#/$defs/"):
+				return resolve(defs[ref[len("#/$defs/"):]])
+			return {k: resolve(v) for k, v in node.items()}
+		if isinstance(node, list):
+			return [resolve(v) for v in node]
+		return node
+
+	return resolve(schema)
 
-# CORS
-_cors_origins = [
+
+# orjson encodes the dict responses several times faster than the stdlib json module
+app = FastAPI(title="Hakilens Scraper API", version="0.1.0", default_response_class=ORJSONResponse)
+
+# CORS (a frozenset so per-request origin checks are hash lookups)
+_cors_origins = frozenset({
 	"http://localhost",
 	"http://localhost:3000",
 	"http://localhost:8000",
 	"http://127.0.0.1:3000",
-	"https://www.hakichain.co.ke"
+	"https://www.hakichain.co.ke",
 	"http://127.0.0.1:8000",
 	"https://f9e4cc818023.ngrok-free.app",
 	"http://f9e4cc818023.ngrok-free.app",
-	"https://hakichain-v2-tau.vercel.app"
+	"https://hakichain-v2-tau.vercel.app",
 	"https://hakichain-v2-80w6zdu88-clara-clency.vercel.app",
 	"*",  # Allow all origins for development - be more restrictive in production
-]
+})
 app.add_middleware(
 	CORSMiddleware,
 	allow_origins=_cors_origins,
@@ -63,95 +107,416 @@ app.add_middleware(
 	allow_headers=["*"],
 )
 
+class StripPrefixMiddleware:
+	"""Plain ASGI middleware that drops a path prefix before routing.
+
+	Unlike ``@app.middleware("http")`` it does not wrap each request and
+	response in BaseHTTPMiddleware's streaming machinery.
+	"""
+
+	def __init__(self, app, prefix: str) -> None:
+		self.app = app
+		self.prefix = prefix
+
+	async def __call__(self, scope, receive, send) -> None:
+		if scope["type"] in ("http", "websocket"):
+			path = scope["path"]
+			if path.startswith(self.prefix):
+				scope = dict(scope, path=path[len(self.prefix):] or "/")
+		await self.app(scope, receive, send)
+
+
 # Accept alternate base path used by some deployments/clients: /api/hakilens
-@app.middleware("http")
-async def strip_alt_prefix(request, call_next):
-	prefix = "/api/hakilens"
-	path = request.url.path
-	if path.startswith(prefix):
-		new_path = path[len(prefix):] or "/"
-		request.scope["path"] = new_path
-	return await call_next(request)
+app.add_middleware(StripPrefixMiddleware, prefix="/api/hakilens")
 
 
-def get_llm_client_and_model(requested_model: str = "gpt-4o-mini"):
-	"""Get the appropriate LLM client based on available API keys."""
-	
+def _build_openai_client() -> AsyncOpenAI:
+	# One pooled httpx client keeps TLS connections to the API warm
+	return AsyncOpenAI(
+		api_key=_llm_settings.openai_api_key,
+		http_client=httpx.AsyncClient(
+			limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+		),
+	)
+
+
+def _init_llm_state() -> None:
+	"""Build the LLM client once and cache it on ``app.state``."""
 	# Priority order: Gemini -> OpenAI
 	if _llm_settings.gemini_api_key:
 		genai.configure(api_key=_llm_settings.gemini_api_key)
-		return "gemini", genai.GenerativeModel("gemini-flash-latest"), "gemini-flash-latest"
-	
+		app.state.llm_client_type = "gemini"
+		app.state.llm_client = genai.GenerativeModel("gemini-flash-latest")
+		app.state.llm_model = "gemini-flash-latest"
 	elif _llm_settings.openai_api_key:
-		client = OpenAI(api_key=_llm_settings.openai_api_key)
-		return "openai", client, requested_model
-	
+		app.state.llm_client_type = "openai"
+		app.state.llm_client = _build_openai_client()
+		app.state.llm_model = None
 	else:
+		app.state.llm_client_type = None
+		app.state.llm_client = None
+		app.state.llm_model = None
+
+
+def get_llm_client_and_model(requested_model: str = "gpt-4o-mini"):
+	"""Get the appropriate LLM client based on available API keys."""
+	if getattr(app.state, "llm_client_type", None) is None:
+		_init_llm_state()
+	if app.state.llm_client_type is None:
 		raise HTTPException(status_code=500, detail="No LLM configured. Set Gemini or OpenAI keys in config/env.")
+	return app.state.llm_client_type, app.state.llm_client, app.state.llm_model or requested_model
+
 
+# Caps concurrent provider calls so a slow upstream cannot pile up unbounded work
+LLM_SEM = asyncio.Semaphore(_llm_settings.llm_max_inflight)
+_LLM_ACQUIRE_TIMEOUT = 0.5
 
-def generate_completion(client_type: str, client, model: str, messages: list, temperature: float = 0.2) -> str:
+
+async def _acquire_llm_slot() -> None:
+	try:
+		await asyncio.wait_for(LLM_SEM.acquire(), timeout=_LLM_ACQUIRE_TIMEOUT)
+	except asyncio.TimeoutError:
+		raise HTTPException(status_code=503, detail="LLM busy, please retry shortly")
+
+
+def _llm_timeout_error() -> HTTPException:
+	return HTTPException(status_code=504, detail="LLM request timed out")
+
+
+def _gemini_prompt(messages: list) -> str:
+	# Convert messages to a single prompt for Gemini
+	prompt_parts = []
+	for msg in messages:
+		if msg["role"] == "system":
+			prompt_parts.append(f"System: {msg['content']}")
+		elif msg["role"] == "user":
+			prompt_parts.append(f"User: {msg['content']}")
+	return "\n\n".join(prompt_parts)
+
+
+async def generate_completion(client_type: str, client, model: str, messages: list, temperature: float = 0.2) -> str:
 	"""Generate completion using the appropriate client type."""
-	
-	if client_type == "gemini":
-		# Convert messages to a single prompt for Gemini
-		prompt_parts = []
-		for msg in messages:
-			if msg["role"] == "system":
-				prompt_parts.append(f"System: {msg['content']}")
-			elif msg["role"] == "user":
-				prompt_parts.append(f"User: {msg['content']}")
-		
-		prompt = "\n\n".join(prompt_parts)
-		response = client.generate_content(prompt)
-		return response.text.strip()
-	
-	else:  # OpenAI
-		resp = client.chat.completions.create(
-			model=model,
-			messages=messages,
-			temperature=temperature,
-		)
-		return resp.choices[0].message.content.strip()
+	timeout = _llm_settings.llm_timeout_seconds
+	await _acquire_llm_slot()
+	try:
+		async with asyncio.timeout(timeout):
+			if client_type == "gemini":
+				response = await client.generate_content_async(_gemini_prompt(messages))
+				return response.text.strip()
+			
+			else:  # OpenAI
+				resp = await client.chat.completions.create(
+					model=model,
+					messages=messages,
+					temperature=temperature,
+					timeout=timeout,
+				)
+				return resp.choices[0].message.content.strip()
+	except TimeoutError:
+		raise _llm_timeout_error()
+	finally:
+		LLM_SEM.release()
+
+
+async def stream_completion(client_type: str, client, model: str, messages: list, temperature: float = 0.2) -> AsyncIterator[str]:
+	"""Yield completion text deltas as the provider produces them.
+
+	Only waits on the provider are timed: opening the stream, then each chunk,
+	gets LLM_TIMEOUT_SECONDS. A long answer that keeps producing tokens is not
+	cut off, and time spent paused at ``yield`` on a slow client is not counted.
+	The LLM slot is held for the streaming lifetime and released as soon as the
+	provider stream ends or fails.
+	"""
+	timeout = _llm_settings.llm_timeout_seconds
+	await _acquire_llm_slot()
+	try:
+		async with asyncio.timeout(timeout):
+			if client_type == "gemini":
+				chunks = await client.generate_content_async(_gemini_prompt(messages), stream=True)
+			else:  # OpenAI
+				chunks = await client.chat.completions.create(
+					model=model,
+					messages=messages,
+					temperature=temperature,
+					stream=True,
+					timeout=timeout,
+				)
+		chunks = aiter(chunks)
+		while True:
+			try:
+				chunk = await asyncio.wait_for(anext(chunks), timeout)
+			except StopAsyncIteration:
+				break
+			if client_type == "gemini":
+				delta = chunk.text
+			else:
+				delta = chunk.choices[0].delta.content if chunk.choices else None
+			if delta:
+				# Outside any timeout scope, so a cancellation never lands in the send
+				yield delta
+	except TimeoutError:
+		raise _llm_timeout_error()
+	finally:
+		LLM_SEM.release()
+
+
+async def infer_completions(tasks: list[tuple]) -> list:
+	"""Run a batch of ``generate_completion`` argument tuples concurrently.
+
+	Neither provider exposes a multi-prompt chat endpoint, so a batch is one
+	parallel fan-out; failures are returned in place so one bad prompt does not
+	fail its neighbours.
+	"""
+	return await asyncio.gather(*(generate_completion(*t) for t in tasks), return_exceptions=True)
+
+
+def _llm_cache_key(messages: list, model: str, temperature: float) -> bytes:
+	payload = json.dumps([messages, model, temperature], ensure_ascii=False, separators=(",", ":"))
+	return hashlib.blake2b(payload.encode("utf-8")).digest()
+
+
+def _cache_lookup(key: bytes) -> str | None:
+	with get_session() as session:
+		return session.query(LLMCache.response).filter(LLMCache.hash == key).scalar()
+
+
+def _cache_store(key: bytes, response: str, case_id: int | None) -> None:
+	with db_write_lock, get_session() as session:
+		session.merge(LLMCache(hash=key, case_id=case_id, response=response))
+
+
+class _AnswerCache:
+	"""In-process LRU of recent LLM answers with a TTL, in front of the llm_cache table.
+
+	Keys are prompt hashes, so changed case text or retrieval context is a
+	different key rather than a stale entry. Only touched from the event loop.
+	"""
+
+	def __init__(self, maxsize: int = 1024, ttl: float = 3600.0) -> None:
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self._data: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+
+	def get(self, key: bytes) -> str | None:
+		item = self._data.get(key)
+		if item is None:
+			return None
+		if item[0] < time.monotonic():
+			del self._data[key]
+			return None
+		self._data.move_to_end(key)
+		return item[1]
+
+	def put(self, key: bytes, value: str) -> None:
+		self._data[key] = (time.monotonic() + self.ttl, value)
+		self._data.move_to_end(key)
+		while len(self._data) > self.maxsize:
+			self._data.popitem(last=False)
+
+
+answer_cache = _AnswerCache()
+
+
+async def _lookup_answer(key: bytes) -> str | None:
+	"""Check the in-process cache, then the llm_cache table."""
+	answer = answer_cache.get(key)
+	if answer is None:
+		answer = await run_in_threadpool(_cache_lookup, key)
+		if answer is not None:
+			answer_cache.put(key, answer)
+	return answer
+
+
+async def _store_answer(key: bytes, answer: str, case_id: int | None) -> None:
+	answer_cache.put(key, answer)
+	await run_in_threadpool(_cache_store, key, answer, case_id)
+
+
+async def cached_completion(
+	client_type: str,
+	client,
+	model: str,
+	messages: list,
+	temperature: float = 0.2,
+	case_id: int | None = None,
+) -> str:
+	"""Return a stored answer for an identical prompt, otherwise ask the LLM and store it."""
+	key = _llm_cache_key(messages, model, temperature)
+	hit = await _lookup_answer(key)
+	if hit is not None:
+		return hit
+	answer = await llm_batcher.process_batched((client_type, client, model, messages, temperature))
+	await _store_answer(key, answer, case_id)
+	return answer
+
+
+def _sse(payload: dict[str, Any]) -> str:
+	return f"data: {json.dumps(payload)}\n\n"
+
+
+def sse_completion(
+	client_type: str,
+	client,
+	model: str,
+	messages: list,
+	temperature: float = 0.2,
+	case_id: int | None = None,
+	finalize: Callable[[str], str] | None = None,
+	extra: dict[str, Any] | None = None,
+) -> StreamingResponse:
+	"""Stream a completion as Server-Sent Events ending with a ``done`` event.
+
+	Cache hits are sent as a single delta; fresh answers are stored once the
+	stream completes. ``finalize`` post-processes the full text for the final event.
+	"""
+	async def events() -> AsyncIterator[str]:
+		key = _llm_cache_key(messages, model, temperature)
+		answer = await _lookup_answer(key)
+		try:
+			if answer is not None:
+				yield _sse({"delta": answer})
+			else:
+				parts: list[str] = []
+				async for delta in stream_completion(client_type, client, model, messages, temperature):
+					parts.append(delta)
+					yield _sse({"delta": delta})
+				answer = "".join(parts).strip()
+				await _store_answer(key, answer, case_id)
+		except Exception as e:
+			print("LLM stream error:\n" + traceback.format_exc())
+			yield _sse({"error": getattr(e, "detail", None) or str(e)})
+			return
+		done: dict[str, Any] = {"done": True, **(extra or {})}
+		if finalize is not None:
+			done["response"] = finalize(answer)
+		yield _sse(done)
+
+	return StreamingResponse(events(), media_type="text/event-stream")
+
+
+class DynBatcher:
+	"""Coalesce requests arriving within ``max_delay`` seconds into one ``infer`` call."""
+
+	def __init__(
+		self,
+		infer: Callable[[list], Awaitable[list]],
+		max_batch_size: int = 8,
+		max_delay: float = 0.05,
+	) -> None:
+		self._infer = infer
+		self.max_batch_size = max_batch_size
+		self.max_delay = max_delay
+		self._queue: asyncio.Queue | None = None
+		self._worker: asyncio.Task | None = None
+		self._inflight: set[asyncio.Task] = set()
+
+	def start(self) -> None:
+		if self._worker is None or self._worker.done():
+			self._queue = asyncio.Queue()
+			self._worker = asyncio.create_task(self._collect())
+
+	async def stop(self) -> None:
+		if self._worker is not None:
+			self._worker.cancel()
+			try:
+				await self._worker
+			except asyncio.CancelledError:
+				pass
+			self._worker = None
+		if self._inflight:
+			await asyncio.gather(*self._inflight, return_exceptions=True)
+
+	async def process_batched(self, item: Any) -> Any:
+		self.start()
+		future = asyncio.get_running_loop().create_future()
+		await self._queue.put((item, future))
+		return await future
+
+	async def _collect(self) -> None:
+		loop = asyncio.get_running_loop()
+		while True:
+			batch = [await self._queue.get()]
+			deadline = loop.time() + self.max_delay
+			while len(batch) < self.max_batch_size:
+				remaining = deadline - loop.time()
+				if remaining <= 0:
+					break
+				try:
+					batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+				except asyncio.TimeoutError:
+					break
+			# Dispatch without waiting so the next window starts collecting immediately
+			task = asyncio.create_task(self._dispatch(batch))
+			self._inflight.add(task)
+			task.add_done_callback(self._inflight.discard)
+
+	async def _dispatch(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+		try:
+			results = await self._infer([item for item, _ in batch])
+		except Exception as e:
+			results = [e] * len(batch)
+		for (_, future), result in zip(batch, results):
+			if future.done():
+				continue
+			if isinstance(result, BaseException):
+				future.set_exception(result)
+			else:
+				future.set_result(result)
+
+
+llm_batcher = DynBatcher(infer_completions, max_batch_size=8, max_delay=0.05)
+
+
+_HDR_LINE = re.compile(r"\n#[^\n]*")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+
+def _pad_header(m: re.Match) -> str:
+	# Blank line before/after a header unless the neighbouring line is already blank
+	text = m.string
+	start, end = m.span()
+	line = m.group()
+	if start > 0 and text[text.rfind("\n", 0, start) + 1:start].strip():
+		line = "\n" + line
+	if end < len(text):
+		nxt = text.find("\n", end + 1)
+		if text[end + 1:nxt if nxt != -1 else len(text)].strip():
+			line += "\n"
+	return line
 
 
 def post_process_markdown(text: str) -> str:
 	"""Post-process AI response to improve markdown formatting."""
-	lines = text.split('\n')
-	processed_lines = []
-	
-	for i, line in enumerate(lines):
-		# Ensure proper spacing after headers
-		if line.startswith('#') and i > 0 and lines[i-1].strip() != '':
-			processed_lines.append('')
-		
-		processed_lines.append(line)
-		
-		# Add spacing after headers
-		if line.startswith('#') and i < len(lines) - 1 and lines[i+1].strip() != '':
-			processed_lines.append('')
-	
-	# Join lines and clean up extra spacing
-	result = '\n'.join(processed_lines)
-	
-	# Clean up multiple consecutive blank lines
-	while '\n\n\n' in result:
-		result = result.replace('\n\n\n', '\n\n')
+	# Only header lines are visited (a literal "\n#" scan), then blank runs collapse
+	result = _HDR_LINE.sub(_pad_header, "\n" + text)[1:]
+	result = _BLANK_RUNS.sub("\n\n", result)
 	
 	# Ensure the response starts with proper identification
-	if not result.startswith('# ') and not result.startswith('## '):
+	if not result.startswith(('# ', '## ')):
 		result = f"## Legal Information\n\n{result}"
 	
 	# Add footer disclaimer if not present
-	if 'consult' not in result.lower() or 'lawyer' not in result.lower():
+	lowered = result.lower()
+	if 'consult' not in lowered or 'lawyer' not in lowered:
 		result += "\n\n---\n\n> **Disclaimer**: This information is for general guidance only. Please consult with a qualified Kenyan lawyer for advice specific to your situation."
 	
 	return result.strip()
 
 
 @app.on_event("startup")
-def startup_event() -> None:
+async def startup_event() -> None:
 	init_db()
+	_load_index_html()
+	_init_llm_state()
+	llm_batcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+	await llm_batcher.stop()
+	if getattr(app.state, "llm_client_type", None) == "openai":
+		await app.state.llm_client.close()
+	app.state.llm_client_type = None
 
 
 @app.get("/health")
@@ -159,69 +524,167 @@ def health() -> dict[str, str]:
 	return {"status": "ok"}
 
 
-@app.post("/scrape/url")
+# --- Scrape endpoints ---
+# Scrapes can take minutes, so they are queued as background jobs and the
+# request returns 202 with a job id; poll GET /jobs/{job_id} for the result.
+
+def create_job(kind: str) -> str:
+	job_id = uuid.uuid4().hex
+	with db_write_lock, get_session() as session:
+		session.add(Job(id=job_id, kind=kind, status="queued"))
+	return job_id
+
+
+def _set_job_state(job_id: str, status: str, result: Any = None, error: str | None = None) -> None:
+	with db_write_lock, get_session() as session:
+		job = session.get(Job, job_id)
+		if job is None:
+			return
+		job.status = status
+		if result is not None:
+			job.result_json = json.dumps(result)
+		job.error = error
+
+
+def run_job(job_id: str, func: Callable[[], dict[str, Any]]) -> None:
+	_set_job_state(job_id, "running")
+	try:
+		result = func()
+	except Exception as e:
+		print(f"job {job_id} error:\n" + traceback.format_exc())
+		_set_job_state(job_id, "failed", error=str(e))
+		return
+	_set_job_state(job_id, "succeeded", result=result)
+
+
+def _enqueue(background_tasks: BackgroundTasks, kind: str, func: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+	job_id = create_job(kind)
+	background_tasks.add_task(run_job, job_id, func)
+	return {"job_id": job_id, "status": "queued"}
+
+
+def _require_http_url(url: str) -> None:
+	if not (url.startswith("http://") or url.startswith("https://")):
+		raise HTTPException(status_code=400, detail="Invalid url. Must start with http(s)://")
+
+
+@app.post("/scrape/url", status_code=202)
 def api_scrape_url(
+	background_tasks: BackgroundTasks,
 	url: str = Query(..., description="Case detail or listing URL"),
 	deep: bool = Query(True, description="Enable deeper extraction (AKN/PDF text)"),
 ) -> dict[str, Any]:
-	try:
-		if not (url.startswith("http://") or url.startswith("https://")):
-			raise HTTPException(status_code=400, detail="Invalid url. Must start with http(s)://")
-		ids = scrape_url(url, deep=deep)
-		return {"saved_case_ids": ids}
-	except Exception as e:
-		print("/scrape/url error:\n" + traceback.format_exc())
-		raise HTTPException(status_code=500, detail=str(e))
+	_require_http_url(url)
+	return _enqueue(background_tasks, "scrape_url", lambda: {"saved_case_ids": scrape_url(url, deep=deep)})
 
 
-@app.post("/scrape/listing")
-def api_crawl_listing(url: str, max_pages: int | None = None, deep: bool = True) -> dict[str, Any]:
-	try:
-		ids = crawl_listing(url, max_pages=max_pages, deep=deep)
-		return {"saved_case_ids": ids}
-	except Exception as e:
-		print("/scrape/listing error:\n" + traceback.format_exc())
-		raise HTTPException(status_code=500, detail=str(e))
+@app.post("/scrape/listing", status_code=202)
+def api_crawl_listing(background_tasks: BackgroundTasks, url: str, max_pages: int | None = None, deep: bool = True) -> dict[str, Any]:
+	return _enqueue(
+		background_tasks,
+		"crawl_listing",
+		lambda: {"saved_case_ids": crawl_listing(url, max_pages=max_pages, deep=deep)},
+	)
 
 
-@app.post("/scrape/case")
-def api_scrape_case(url: str, deep: bool = True) -> dict[str, Any]:
-	try:
-		if not (url.startswith("http://") or url.startswith("https://")):
-			raise HTTPException(status_code=400, detail="Invalid url. Must start with http(s)://")
-		cid = scrape_case_detail(url, deep=deep)
-		return {"saved_case_id": cid}
-	except Exception as e:
-		print("/scrape/case error:\n" + traceback.format_exc())
-		raise HTTPException(status_code=500, detail=str(e))
+@app.post("/scrape/case", status_code=202)
+def api_scrape_case(background_tasks: BackgroundTasks, url: str, deep: bool = True) -> dict[str, Any]:
+	_require_http_url(url)
+	return _enqueue(background_tasks, "scrape_case", lambda: {"saved_case_id": scrape_case_detail(url, deep=deep)})
 
 
-@app.post("/scrape/search")
-def api_scrape_search(q: str = Query(..., description="Case number or keywords"), deep: bool = True) -> dict[str, Any]:
-	try:
-		ids = search_and_scrape(q, deep=deep)
-		return {"saved_case_ids": ids, "query": q}
-	except Exception as e:
-		print("/scrape/search error:\n" + traceback.format_exc())
-		raise HTTPException(status_code=500, detail=str(e))
+@app.post("/scrape/search", status_code=202)
+def api_scrape_search(
+	background_tasks: BackgroundTasks,
+	q: str = Query(..., description="Case number or keywords"),
+	deep: bool = True,
+) -> dict[str, Any]:
+	return _enqueue(
+		background_tasks,
+		"search_and_scrape",
+		lambda: {"saved_case_ids": search_and_scrape(q, deep=deep), "query": q},
+	)
 
 
-@app.get("/cases")
-def list_cases(q: str | None = None, limit: int = 50, offset: int = 0) -> dict[str, Any]:
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str) -> dict[str, Any]:
 	with get_session() as session:
-		query = session.query(Case).order_by(Case.id.desc())
-		if q:
-			pattern = f"%{q}%"
-			query = query.filter(
-				(Case.title.ilike(pattern))
-				| (Case.case_number.ilike(pattern))
-				| (Case.court.ilike(pattern))
-				| (Case.citation.ilike(pattern))
-			)
-		total = query.count()
-		rows = query.limit(limit).offset(offset).all()
+		job = session.get(Job, job_id)
+		if not job:
+			raise HTTPException(status_code=404, detail="job not found")
 		return {
-			"total": total,
+			"job_id": job.id,
+			"kind": job.kind,
+			"status": job.status,
+			"result": json.loads(job.result_json) if job.result_json else None,
+			"error": job.error,
+		}
+
+
+# Columns returned by /cases; selecting them explicitly keeps the heavy
+# content_text/summary TEXT columns inside SQLite
+_CASE_LIST_COLUMNS = (Case.id, Case.url, Case.title, Case.case_number, Case.court, Case.date, Case.citation)
+_CASE_DETAIL_COLUMNS = _CASE_LIST_COLUMNS + (Case.parties, Case.judges, Case.summary)
+
+
+# /cases statements are built once with bind parameters, so every request
+# reuses the same compiled SQL from SQLAlchemy's statement cache
+_CASE_SEARCH_FILTER = or_(
+	Case.title.ilike(bindparam("pattern")),
+	Case.case_number.ilike(bindparam("pattern")),
+	Case.court.ilike(bindparam("pattern")),
+	Case.citation.ilike(bindparam("pattern")),
+)
+_CASES_PAGE_STMT = (
+	select(*_CASE_LIST_COLUMNS).order_by(Case.id.desc()).limit(bindparam("limit")).offset(bindparam("offset"))
+)
+_CASES_SEARCH_STMT = _CASES_PAGE_STMT.where(_CASE_SEARCH_FILTER)
+_CASES_BY_IDS_STMT = (
+	select(*_CASE_LIST_COLUMNS).where(Case.id.in_(bindparam("ids", expanding=True))).order_by(Case.id.desc())
+)
+_CASES_COUNT_STMT = select(func.count()).select_from(Case)
+_CASES_SEARCH_COUNT_STMT = _CASES_COUNT_STMT.where(_CASE_SEARCH_FILTER)
+# FTS matches whole tokens and their prefixes only, so case numbers and
+# citations keep the substring match (q=123 finds "E123/2020")
+_FTS_MATCH_SQL = (
+	"SELECT rowid FROM cases_fts WHERE cases_fts MATCH :q "
+	"UNION SELECT id FROM cases WHERE case_number LIKE :pattern OR citation LIKE :pattern"
+)
+_FTS_COUNT_SQL = text(f"SELECT count(*) FROM ({_FTS_MATCH_SQL})")
+_FTS_PAGE_SQL = text(f"{_FTS_MATCH_SQL} ORDER BY 1 DESC LIMIT :limit OFFSET :offset")
+
+
+@app.get("/cases")
+def list_cases(
+	q: str | None = None,
+	limit: int = 50,
+	offset: int = 0,
+	include_total: bool = Query(False, description="Also count all matching cases"),
+) -> ORJSONResponse:
+	with get_session() as session:
+		match = fts_query(q, columns=("title", "case_number", "court", "citation")) if q and fts_enabled() else None
+		total = None
+		# Fetch one extra row to learn whether another page exists without a COUNT(*)
+		params = {"limit": limit + 1, "offset": offset}
+		if match:
+			params["q"] = match
+			params["pattern"] = f"%{q}%"
+			if include_total:
+				total = session.execute(_FTS_COUNT_SQL, params).scalar()
+			ids = session.execute(_FTS_PAGE_SQL, params).scalars().all()
+			rows = session.execute(_CASES_BY_IDS_STMT, {"ids": ids}).all() if ids else []
+		elif q:
+			params["pattern"] = f"%{q}%"
+			if include_total:
+				total = session.execute(_CASES_SEARCH_COUNT_STMT, params).scalar()
+			rows = session.execute(_CASES_SEARCH_STMT, params).all()
+		else:
+			if include_total:
+				total = session.execute(_CASES_COUNT_STMT).scalar()
+			rows = session.execute(_CASES_PAGE_STMT, params).all()
+		has_more = len(rows) > limit
+		result: dict[str, Any] = {
+			"has_more": has_more,
 			"items": [
 				{
 					"id": c.id,
@@ -232,18 +695,24 @@ def list_cases(q: str | None = None, limit: int = 50, offset: int = 0) -> dict[s
 					"date": c.date,
 					"citation": c.citation,
 				}
-				for c in rows
+				for c in rows[:limit]
 			],
 		}
+		if include_total:
+			result["total"] = total
+		# Returned as a response object so the page skips FastAPI's
+		# return-value validation and jsonable_encoder walk
+		return ORJSONResponse(result)
 
 
 @app.get("/cases/{case_id}")
-def get_case(case_id: int) -> dict[str, Any]:
+def get_case(case_id: int, full: bool = Query(True, description="Include content_text")) -> dict[str, Any]:
 	with get_session() as session:
-		c = session.get(Case, case_id)
+		columns = _CASE_DETAIL_COLUMNS + (Case.content_text,) if full else _CASE_DETAIL_COLUMNS
+		c = session.query(*columns).filter(Case.id == case_id).one_or_none()
 		if not c:
 			raise HTTPException(status_code=404, detail="case not found")
-		return {
+		result = {
 			"id": c.id,
 			"url": c.url,
 			"title": c.title,
@@ -254,14 +723,46 @@ def get_case(case_id: int) -> dict[str, Any]:
 			"date": c.date,
 			"citation": c.citation,
 			"summary": c.summary,
-			"content_text": c.content_text,
 		}
+		if full:
+			result["content_text"] = c.content_text
+		return result
 
 
 # --- AI endpoints (summaries and RAG-style prompt over DB) ---
+# Handlers are async so the event loop is free while waiting on the LLM; the
+# blocking SQLAlchemy work is pushed to the threadpool via run_in_threadpool.
 
-@app.post("/ai/summarize/{case_id}")
-def summarize_case(case_id: int, model: str = Query("gpt-4o-mini")) -> dict[str, Any]:
+# System prompts are built once at import; message lists reuse these dicts
+_SUMMARIZE_SYSTEM_MSG = {"role": "system", "content": "You are a concise legal assistant for Kenyan case law."}
+_ASK_SYSTEM_MSG = {"role": "system", "content": "You answer using provided legal context only."}
+_CHAT_SYSTEM_MSG = {"role": "system", "content": "You answer using the provided single-case context only."}
+_CHATBOT_SYSTEM_PROMPT = (
+	"You are HakiBot, a helpful legal assistant for Kenyan law. You provide accurate, "
+	"professional legal information and guidance using well-structured markdown formatting.\n\n"
+	"FORMATTING REQUIREMENTS:\n"
+	"- Use clear headings with ## for main sections and ### for subsections\n"
+	"- Create numbered lists for step-by-step processes\n"
+	"- Use bullet points for key rights, obligations, or important points\n"
+	"- Use tables for comparing information when appropriate\n"
+	"- Use **bold text** for emphasis on critical legal terms\n"
+	"- Use `code formatting` for specific legal references or case citations\n"
+	"- Add horizontal rules (---) to separate major sections\n"
+	"- Include clear introductions and conclusions\n"
+	"- Use blockquotes (>) for important warnings or disclaimers\n\n"
+	"CONTENT REQUIREMENTS:\n"
+	"- Always be precise and cite relevant laws, acts, or cases when possible\n"
+	"- Provide practical examples where helpful\n"
+	"- Include relevant legal references in the format: `Act Name (Cap. Number)`\n"
+	"- If you're unsure about something, clearly state your limitations\n"
+	"- Always recommend consulting with a qualified lawyer for specific cases\n"
+	"- Structure complex information with clear headings and subheadings\n\n"
+	"Remember: Your responses should be comprehensive, well-organized, and easy to read when rendered as markdown."
+)
+_CHATBOT_SYSTEM_MSG = {"role": "system", "content": _CHATBOT_SYSTEM_PROMPT}
+
+
+def _load_summary_text(case_id: int) -> tuple[str, str | None]:
 	with get_session() as session:
 		c = session.get(Case, case_id)
 		if not c:
@@ -269,119 +770,167 @@ def summarize_case(case_id: int, model: str = Query("gpt-4o-mini")) -> dict[str,
 		text = c.content_text or c.title or c.citation or ""
 		if not text:
 			raise HTTPException(status_code=400, detail="no content to summarize")
+		return text, c.summary
+
+
+def _store_summary(case_id: int, summary: str) -> None:
+	with db_write_lock, get_session() as session:
+		c = session.get(Case, case_id)
+		if c:
+			c.summary = summary
 
-		client_type, client, use_model = get_llm_client_and_model(model)
-		
-		prompt = f"Summarize this Kenyan case for a lawyer. Include facts, issues, holding, and outcome in 5-8 bullets.\n\n{text[:20000]}"
-		messages = [
-			{"role": "system", "content": "You are a concise legal assistant for Kenyan case law."},
-			{"role": "user", "content": prompt},
-		]
-		
-		summary = generate_completion(client_type, client, use_model, messages, temperature=0.2)
-		
-		c.summary = summary
-		from .db import db_write_lock
-		with db_write_lock:
-			session.flush()
-		return {"case_id": c.id, "summary": summary}
 
+@app.post("/ai/summarize/{case_id}")
+async def summarize_case(
+	case_id: int,
+	model: str = Query("gpt-4o-mini"),
+	refresh: bool = Query(False, description="Ignore the stored summary and regenerate it"),
+) -> dict[str, Any]:
+	text, stored = await run_in_threadpool(_load_summary_text, case_id)
+	# The stored summary is cleared whenever content_text changes, so it is current
+	if stored and not refresh:
+		return {"case_id": case_id, "summary": stored}
+
+	client_type, client, use_model = get_llm_client_and_model(model)
+	
+	prompt = f"Summarize this Kenyan case for a lawyer. Include facts, issues, holding, and outcome in 5-8 bullets.\n\n{text[:20000]}"
+	messages = [
+		_SUMMARIZE_SYSTEM_MSG,
+		{"role": "user", "content": prompt},
+	]
+	
+	summary = await cached_completion(client_type, client, use_model, messages, 0.2, case_id=case_id)
+	
+	await run_in_threadpool(_store_summary, case_id, summary)
+	return {"case_id": case_id, "summary": summary}
+
+
+# Excerpts are cut inside the database so full judgments never reach Python
+_ASK_EXCERPT_CHARS = 4000
+_ASK_FTS_SQL = text(
+	"SELECT c.id, c.title, c.case_number, c.court, c.date, substr(c.content_text, 1, :chars) AS excerpt "
+	"FROM cases_fts JOIN cases AS c ON c.id = cases_fts.rowid "
+	"WHERE cases_fts MATCH :q ORDER BY bm25(cases_fts) LIMIT :k"
+)
+
+
+def _retrieve_ask_contexts(q: str, k: int) -> tuple[list[str], list[int]]:
+	with get_session() as session:
+		match = fts_query(q, any_term=True) if fts_enabled() else None
+		if match:
+			# bm25-ranked full-text retrieval, best matches first
+			rows = session.execute(_ASK_FTS_SQL, {"q": match, "k": k, "chars": _ASK_EXCERPT_CHARS}).all()
+		else:
+			# naive keyword search across title/content
+			pattern = f"%{q}%"
+			rows = (
+				session.query(
+					Case.id,
+					Case.title,
+					Case.case_number,
+					Case.court,
+					Case.date,
+					func.substr(Case.content_text, 1, _ASK_EXCERPT_CHARS).label("excerpt"),
+				)
+				.filter((Case.title.ilike(pattern)) | (Case.content_text.ilike(pattern)))
+				.order_by(Case.id.desc())
+				.limit(k)
+				.all()
+			)
+		# Order the chosen cases by id so the same retrieval set always yields a
+		# byte-identical prompt (provider prefix cache, and our own llm_cache)
+		rows = sorted(rows, key=lambda r: r.id)
+		contexts = [
+			f"Title: {r.title}\nCase No: {r.case_number}\nCourt: {r.court}\nDate: {r.date}\nExcerpt:\n{r.excerpt or ''}"
+			for r in rows
+		]
+		return contexts, [r.id for r in rows]
 
 
 @app.post("/ai/ask")
-def ask_ai(q: str = Body(..., embed=True), model: str = Query("gpt-4o-mini"), k: int = Query(5)) -> dict[str, Any]:
+async def ask_ai(
+	q: str = Body(..., embed=True),
+	model: str = Query("gpt-4o-mini"),
+	k: int = Query(5),
+	stream: bool = Query(False, description="Stream the answer as Server-Sent Events"),
+):
 	"""Simple DB keyword retrieval + LLM answer (starter RAG)."""
 
-	with get_session() as session:
-		# naive keyword search across title/content
-		pattern = f"%{q}%"
-		rows = (
-			session.query(Case)
-			.filter((Case.title.ilike(pattern)) | (Case.content_text.ilike(pattern)))
-			.order_by(Case.id.desc())
-			.limit(k)
-			.all()
-		)
-		contexts = []
-		for c in rows:
-			ctx = f"Title: {c.title}\nCase No: {c.case_number}\nCourt: {c.court}\nDate: {c.date}\nExcerpt:\n{(c.content_text or '')[:4000]}"
-			contexts.append(ctx)
+	contexts, used_cases = await run_in_threadpool(_retrieve_ask_contexts, q, k)
 
-		client_type, client, use_model = get_llm_client_and_model(model)
-		
-		prompt = (
-			"You are a Kenyan legal research assistant. Use only the provided context to answer. "
-			"Cite titles of cases you used. If unsure, say you don't know.\n\n" +
-			"\n\n".join(contexts) +
-			f"\n\nQuestion: {q}\nAnswer:"
-		)
-		messages = [
-			{"role": "system", "content": "You answer using provided legal context only."},
-			{"role": "user", "content": prompt},
-		]
-		
-		answer = generate_completion(client_type, client, use_model, messages, temperature=0.2)
-		return {"answer": answer, "used_cases": [c.id for c in rows]}
+	client_type, client, use_model = get_llm_client_and_model(model)
+	
+	prompt = (
+		"You are a Kenyan legal research assistant. Use only the provided context to answer. "
+		"Cite titles of cases you used. If unsure, say you don't know.\n\n" +
+		"\n\n".join(contexts) +
+		f"\n\nQuestion: {q}\nAnswer:"
+	)
+	messages = [
+		_ASK_SYSTEM_MSG,
+		{"role": "user", "content": prompt},
+	]
+	
+	if stream:
+		return sse_completion(client_type, client, use_model, messages, 0.2, extra={"used_cases": used_cases})
+	answer = await cached_completion(client_type, client, use_model, messages, 0.2)
+	return {"answer": answer, "used_cases": used_cases}
 
 
-@app.post("/ai/chat/{case_id}")
-def chat_with_case(case_id: int, q: str = Body(..., embed=True), model: str = Query("gpt-4o-mini")) -> dict[str, Any]:
-	"""Chat about a single case using its stored content and metadata."""
+def _load_chat_context(case_id: int) -> str:
 	with get_session() as session:
 		c = session.get(Case, case_id)
 		if not c:
 			raise HTTPException(status_code=404, detail="case not found")
-		context = (
+		return (
 			f"Title: {c.title}\nCase No: {c.case_number}\nCourt: {c.court}\nDate: {c.date}\nCitation: {c.citation}\n\n"
 			+ (c.content_text or "")[:12000]
 		)
-		
-		client_type, client, use_model = get_llm_client_and_model(model)
-		
-		prompt = (
-			"You are a Kenyan legal assistant. Answer based only on the case content below."
-			" Provide precise, cited references to sections where possible. If unsure, say you don't know.\n\n"
-			+ context + f"\n\nUser: {q}\nAnswer:"
-		)
-		messages = [
-			{"role": "system", "content": "You answer using the provided single-case context only."},
-			{"role": "user", "content": prompt},
-		]
-		
-		answer = generate_completion(client_type, client, use_model, messages, temperature=0.2)
-		return {"answer": answer}
 
 
-@app.post("/api/chatbot", response_model=ChatResponse) 
-def chatbot_endpoint(request: ChatRequest) -> ChatResponse:
+@app.post("/ai/chat/{case_id}")
+async def chat_with_case(
+	case_id: int,
+	q: str = Body(..., embed=True),
+	model: str = Query("gpt-4o-mini"),
+	stream: bool = Query(False, description="Stream the answer as Server-Sent Events"),
+):
+	"""Chat about a single case using its stored content and metadata."""
+	context = await run_in_threadpool(_load_chat_context, case_id)
+	
+	client_type, client, use_model = get_llm_client_and_model(model)
+	
+	prompt = (
+		"You are a Kenyan legal assistant. Answer based only on the case content below."
+		" Provide precise, cited references to sections where possible. If unsure, say you don't know.\n\n"
+		+ context + f"\n\nUser: {q}\nAnswer:"
+	)
+	messages = [
+		_CHAT_SYSTEM_MSG,
+		{"role": "user", "content": prompt},
+	]
+	
+	if stream:
+		return sse_completion(client_type, client, use_model, messages, 0.2, case_id=case_id)
+	answer = await cached_completion(client_type, client, use_model, messages, 0.2, case_id=case_id)
+	return {"answer": answer}
+
+
+@app.post(
+	"/api/chatbot",
+	response_model=ChatResponse,
+	openapi_extra={
+		"requestBody": {"required": True, "content": {"application/json": {"schema": _inline_schema(ChatRequest)}}},
+	},
+)
+async def chatbot_endpoint(
+	request: ChatRequest = Depends(parse_chat_request),
+	stream: bool = Query(False, description="Stream the answer as Server-Sent Events"),
+):
 	"""Legal chatbot endpoint that provides assistance based on the user's message and conversation context."""
 	try:
 		client_type, client, use_model = get_llm_client_and_model()
 		
-		# Build the prompt with context and conversation history
-		system_prompt = (
-			"You are HakiBot, a helpful legal assistant for Kenyan law. You provide accurate, "
-			"professional legal information and guidance using well-structured markdown formatting.\n\n"
-			"FORMATTING REQUIREMENTS:\n"
-			"- Use clear headings with ## for main sections and ### for subsections\n"
-			"- Create numbered lists for step-by-step processes\n"
-			"- Use bullet points for key rights, obligations, or important points\n"
-			"- Use tables for comparing information when appropriate\n"
-			"- Use **bold text** for emphasis on critical legal terms\n"
-			"- Use `code formatting` for specific legal references or case citations\n"
-			"- Add horizontal rules (---) to separate major sections\n"
-			"- Include clear introductions and conclusions\n"
-			"- Use blockquotes (>) for important warnings or disclaimers\n\n"
-			"CONTENT REQUIREMENTS:\n"
-			"- Always be precise and cite relevant laws, acts, or cases when possible\n"
-			"- Provide practical examples where helpful\n"
-			"- Include relevant legal references in the format: `Act Name (Cap. Number)`\n"
-			"- If you're unsure about something, clearly state your limitations\n"
-			"- Always recommend consulting with a qualified lawyer for specific cases\n"
-			"- Structure complex information with clear headings and subheadings\n\n"
-			"Remember: Your responses should be comprehensive, well-organized, and easy to read when rendered as markdown."
-		)
-		
 		# Construct conversation context
 		conversation_context = ""
 		if request.context:
@@ -403,13 +952,14 @@ def chatbot_endpoint(request: ChatRequest) -> ChatResponse:
 		)
 		
 		# Prepare messages for the LLM
-		messages = [
-			{"role": "system", "content": system_prompt},
-			{"role": "user", "content": current_prompt}
-		]
+		messages = [_CHATBOT_SYSTEM_MSG, {"role": "user", "content": current_prompt}]
+		
+		if stream:
+			# Deltas are raw model text; the final event carries the formatted markdown
+			return sse_completion(client_type, client, use_model, messages, 0.3, finalize=post_process_markdown)
 		
 		# Generate response
-		response_text = generate_completion(client_type, client, use_model, messages, temperature=0.3)
+		response_text = await cached_completion(client_type, client, use_model, messages, 0.3)
 		
 		# Post-process response for better markdown formatting
 		formatted_response = post_process_markdown(response_text)
@@ -419,6 +969,8 @@ def chatbot_endpoint(request: ChatRequest) -> ChatResponse:
 			timestamp=datetime.utcnow()
 		)
 		
+	except HTTPException:
+		raise
 	except Exception as e:
 		print(f"/api/chat error:\n{traceback.format_exc()}")
 		raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
@@ -427,10 +979,15 @@ def chatbot_endpoint(request: ChatRequest) -> ChatResponse:
 @app.get("/cases/{case_id}/documents")
 def list_case_documents(case_id: int) -> dict[str, Any]:
 	with get_session() as session:
-		c = session.get(Case, case_id)
-		if not c:
+		# Existence check only; avoids loading the case's content_text
+		if session.query(Case.id).filter_by(id=case_id).scalar() is None:
 			raise HTTPException(status_code=404, detail="case not found")
-		rows = session.query(Document).filter(Document.case_id == case_id).order_by(Document.id).all()
+		rows = (
+			session.query(Document.id, Document.url, Document.file_path, Document.content_type)
+			.filter(Document.case_id == case_id)
+			.order_by(Document.id)
+			.all()
+		)
 		return {
 			"items": [
 				{"id": d.id, "url": d.url, "file_path": d.file_path, "content_type": d.content_type}
@@ -442,32 +999,55 @@ def list_case_documents(case_id: int) -> dict[str, Any]:
 @app.get("/cases/{case_id}/images")
 def list_case_images(case_id: int) -> dict[str, Any]:
 	with get_session() as session:
-		c = session.get(Case, case_id)
-		if not c:
+		if session.query(Case.id).filter_by(id=case_id).scalar() is None:
 			raise HTTPException(status_code=404, detail="case not found")
-		rows = session.query(Image).filter(Image.case_id == case_id).order_by(Image.id).all()
+		rows = session.query(Image.id, Image.url, Image.file_path).filter(Image.case_id == case_id).order_by(Image.id).all()
 		return {"items": [{"id": i.id, "url": i.url, "file_path": i.file_path} for i in rows]}
 
 
-@app.get("/files/pdf/{filename}")
-def serve_pdf(filename: str):
-	path = Path(settings.pdf_dir) / filename
+# Stored files are named after their source URL and only rewritten by a
+# re-scrape, so let clients cache for a day and revalidate via ETag after that
+_FILE_CACHE_CONTROL = "public, max-age=86400"
+
+
+def _cached_file_response(request: Request, path: Path) -> Response:
 	if not path.exists():
 		raise HTTPException(status_code=404, detail="file not found")
-	return FileResponse(path)
+	stat = path.stat()
+	etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+	headers = {"ETag": etag, "Cache-Control": _FILE_CACHE_CONTROL}
+	if_none_match = request.headers.get("if-none-match")
+	if if_none_match and (if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))):
+		return Response(status_code=304, headers=headers)
+	return FileResponse(path, headers=headers)
+
+
+@app.get("/files/pdf/{filename}")
+def serve_pdf(filename: str, request: Request):
+	return _cached_file_response(request, Path(settings.pdf_dir) / filename)
 
 
 @app.get("/files/image/{filename}")
-def serve_image(filename: str):
-	path = Path(settings.image_dir) / filename
-	if not path.exists():
-		raise HTTPException(status_code=404, detail="file not found")
-	return FileResponse(path)
+def serve_image(filename: str, request: Request):
+	return _cached_file_response(request, Path(settings.image_dir) / filename)
+
+
+def _load_index_html() -> None:
+	html = (Path(__file__).resolve().parents[1] / "static" / "index.html").read_bytes()
+	app.state.index_html = html
+	app.state.index_html_gzip = gzip.compress(html, 6)
 
 
 @app.get("/")
-def index() -> HTMLResponse:
-	html = (Path(__file__).resolve().parents[1] / "static" / "index.html").read_text(encoding="utf-8")
-	return HTMLResponse(content=html)
+def index(request: Request) -> Response:
+	if getattr(app.state, "index_html", None) is None:
+		_load_index_html()
+	if "gzip" in request.headers.get("accept-encoding", ""):
+		return Response(
+			content=app.state.index_html_gzip,
+			media_type="text/html",
+			headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+		)
+	return HTMLResponse(content=app.state.index_html, headers={"Vary": "Accept-Encoding"})
 
 
@@ -7,6 +7,10 @@ class Settings:
         self.gemini_api_key = os.getenv("GEMINI_API_KEY", "")
         self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
         
+        # LLM call limits
+        self.llm_max_inflight = int(os.getenv("LLM_MAX_INFLIGHT", "32"))
+        self.llm_timeout_seconds = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+        
         # Database
         self.database_url = os.getenv("DATABASE_URL", "sqlite:///data/hakilens.db")
         
@@ -14,9 +18,18 @@ class Settings:
         self.user_agent = os.getenv("USER_AGENT", "HakilensScraper/1.0")
         self.requests_per_minute = int(os.getenv("REQUESTS_PER_MINUTE", "15"))
         self.request_timeout_seconds = int(os.getenv("REQUEST_TIMEOUT_SECONDS", "30"))
+        self.max_concurrency = max(1, int(os.getenv("MAX_CONCURRENCY", "4")))
+        # SQLite connection pool: one per API threadpool worker (40, which also
+        # runs background scrape jobs) plus one per concurrent case scrape
+        self.db_pool_size = max(1, int(os.getenv("DB_POOL_SIZE", str(40 + self.max_concurrency))))
+        # Reuse fetched pages from the on-disk cache for this long (0 = always fetch)
+        self.html_cache_ttl_seconds = max(0, int(os.getenv("HTML_CACHE_TTL_SECONDS", "0")))
         self.http_proxy = os.getenv("HTTP_PROXY")
         self.https_proxy = os.getenv("HTTPS_PROXY")
         
+        # Parsing: cap on case text joined from a page's HTML (0 = no cap)
+        self.max_content_chars = max(0, int(os.getenv("MAX_CONTENT_CHARS", "32000")))
+        
         # Storage directories
         self.storage_dir = Path(os.getenv("STORAGE_DIR", "./data"))
         self.storage_dir.mkdir(parents=True, exist_ok=True)
@@ -28,6 +41,9 @@ class Settings:
         self.html_dir = self.files_dir / "html"
         self.html_dir.mkdir(parents=True, exist_ok=True)
         
+        self.html_cache_dir = self.files_dir / "html_cache"
+        self.html_cache_dir.mkdir(parents=True, exist_ok=True)
+        
         self.pdf_dir = self.files_dir / "pdf"
         self.pdf_dir.mkdir(parents=True, exist_ok=True)
         
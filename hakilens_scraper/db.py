@@ -8,15 +8,19 @@ from sqlalchemy import (
 	Column,
 	DateTime,
 	ForeignKey,
+	Index,
 	Integer,
+	LargeBinary,
 	MetaData,
 	String,
 	Text,
 	create_engine,
+	text,
 )
 from sqlalchemy.orm import declarative_base, relationship, Session, sessionmaker
-from sqlalchemy import event
-from sqlalchemy.pool import NullPool
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
 import threading
 
 from .config import settings
@@ -44,20 +48,34 @@ def get_engine():
 			url,
 			pool_pre_ping=True,
 			future=True,
-			poolclass=NullPool,
+			# Pooled connections pay the open + PRAGMA setup once, not per session;
+			# WAL lets pooled readers run alongside the writer
+			poolclass=QueuePool,
+			pool_size=settings.db_pool_size,
+			max_overflow=10,
+			# A checkout beyond pool_size + max_overflow fails fast with
+			# TimeoutError instead of stalling the request
+			pool_timeout=5,
+			pool_recycle=1800,
 			connect_args={
 				"check_same_thread": False,
 				"timeout": 30,
 			},
 		)
-		# Set WAL mode and busy timeout for better concurrency
+		if ":memory:" in url or url.rstrip("/") in ("sqlite:", "sqlite+pysqlite:"):
+			return engine
+
+		# WAL lets readers run alongside the single writer; a writer that finds
+		# the database locked waits up to busy_timeout instead of failing
 		@event.listens_for(engine, "connect")
 		def set_sqlite_pragma(dbapi_connection, connection_record):
 			cursor = dbapi_connection.cursor()
 			try:
 				cursor.execute("PRAGMA journal_mode=WAL;")
 				cursor.execute("PRAGMA synchronous=NORMAL;")
-				cursor.execute("PRAGMA busy_timeout=5000;")
+				cursor.execute("PRAGMA busy_timeout=30000;")
+				cursor.execute("PRAGMA temp_store=MEMORY;")
+				cursor.execute("PRAGMA cache_size=-65536;")
 			finally:
 				cursor.close()
 		return engine
@@ -89,6 +107,19 @@ class Case(Base):
 	images = relationship("Image", back_populates="case", cascade="all, delete-orphan")
 
 
+# Trigram GIN indexes back the ILIKE '%q%' searches on PostgreSQL (pg_trgm);
+# SQLite gets the cases_fts table below instead
+_TRGM_INDEXES = [
+	Index(
+		f"ix_cases_{col}_trgm",
+		Case.__table__.c[col],
+		postgresql_using="gin",
+		postgresql_ops={col: "gin_trgm_ops"},
+	).ddl_if(dialect="postgresql")
+	for col in ("title", "case_number", "court", "citation", "content_text")
+]
+
+
 class Document(Base):
 	__tablename__ = "documents"
 
@@ -115,8 +146,104 @@ class Image(Base):
 	case = relationship("Case", back_populates="images")
 
 
+class LLMCache(Base):
+	__tablename__ = "llm_cache"
+
+	hash = Column(LargeBinary(64), primary_key=True)
+	case_id = Column(Integer, ForeignKey("cases.id", ondelete="CASCADE"), index=True)
+	response = Column(Text, nullable=False)
+	created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Job(Base):
+	__tablename__ = "jobs"
+
+	id = Column(String(32), primary_key=True)
+	kind = Column(String(64), nullable=False)
+	status = Column(String(32), nullable=False, default="queued")
+	result_json = Column(Text)
+	error = Column(Text)
+	created_at = Column(DateTime, default=datetime.utcnow)
+	updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def invalidate_case_llm_cache(session, flush_context, instances) -> None:
+	"""Drop cached LLM answers and the stored summary when a case's text changes."""
+	for obj in session.dirty:
+		if not isinstance(obj, Case) or obj.id is None:
+			continue
+		hist = inspect(obj).attrs.content_text.history
+		if not hist.added or (hist.deleted and hist.deleted[0] == hist.added[0]):
+			continue
+		session.query(LLMCache).filter(LLMCache.case_id == obj.id).delete(synchronize_session=False)
+		obj.summary = None
+
+
+# Full-text index over the searchable case columns (SQLite FTS5, external content)
+_FTS_COLUMNS = ("title", "case_number", "court", "citation", "content_text")
+_FTS_DDL = [
+	"CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5("
+	+ ", ".join(_FTS_COLUMNS)
+	+ ", content='cases', content_rowid='id')",
+	"CREATE TRIGGER IF NOT EXISTS cases_fts_ai AFTER INSERT ON cases BEGIN "
+	"INSERT INTO cases_fts(rowid, {cols}) VALUES (new.id, {new}); END",
+	"CREATE TRIGGER IF NOT EXISTS cases_fts_ad AFTER DELETE ON cases BEGIN "
+	"INSERT INTO cases_fts(cases_fts, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+	"CREATE TRIGGER IF NOT EXISTS cases_fts_au AFTER UPDATE OF {cols} ON cases BEGIN "
+	"INSERT INTO cases_fts(cases_fts, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+	"INSERT INTO cases_fts(rowid, {cols}) VALUES (new.id, {new}); END",
+]
+_fts_enabled: bool | None = None
+
+
+def _init_sqlite_fts() -> bool:
+	fmt = {
+		"cols": ", ".join(_FTS_COLUMNS),
+		"new": ", ".join(f"new.{c}" for c in _FTS_COLUMNS),
+		"old": ", ".join(f"old.{c}" for c in _FTS_COLUMNS),
+	}
+	try:
+		with engine.begin() as conn:
+			exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'cases_fts'")).first()
+			for ddl in _FTS_DDL:
+				conn.execute(text(ddl.format(**fmt)))
+			if not exists:
+				# Index rows written before the FTS table existed
+				conn.execute(text("INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')"))
+	except OperationalError:
+		# SQLite built without FTS5; callers fall back to LIKE scans
+		return False
+	return True
+
+
+def fts_enabled() -> bool:
+	return bool(_fts_enabled)
+
+
+def fts_query(q: str, columns: tuple[str, ...] | None = None, any_term: bool = False) -> str | None:
+	"""Escape free text into an FTS5 MATCH expression of quoted prefix terms."""
+	terms = ['"' + t.replace('"', '""') + '"*' for t in q.split() if any(ch.isalnum() for ch in t)]
+	if not terms:
+		return None
+	expr = (" OR " if any_term else " ").join(terms)
+	if columns:
+		expr = "{" + " ".join(columns) + "} : (" + expr + ")"
+	return expr
+
+
 def init_db() -> None:
+	global _fts_enabled
+	if _fts_enabled is None and engine.dialect.name == "postgresql":
+		with engine.begin() as conn:
+			conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
 	Base.metadata.create_all(bind=engine)
+	if _fts_enabled is None:
+		if engine.dialect.name == "postgresql":
+			# create_all skips the indexes of tables that already exist
+			for index in _TRGM_INDEXES:
+				index.create(bind=engine, checkfirst=True)
+		_fts_enabled = engine.dialect.name == "sqlite" and _init_sqlite_fts()
 
 
 @contextmanager
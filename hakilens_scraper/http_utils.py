@@ -1,11 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator, Optional
 
+import httpx
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential_jitter
+from requests.adapters import HTTPAdapter
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+from .config import settings
+from .storage import load_cached_page, save_cached_page
+
+
+# Read size for streamed downloads
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 @dataclass
@@ -17,21 +31,135 @@ class HttpResponse:
 	content_type: Optional[str]
 
 
+class TransientError(Exception):
+	"""A fetch worth retrying: connection error, timeout, 408, 429 or 5xx."""
+
+	def __init__(self, message: str, retry_after: float | None = None) -> None:
+		super().__init__(message)
+		self.retry_after = retry_after
+
+
+class PermanentError(Exception):
+	"""A fetch that will fail the same way again (other 4xx); never retried."""
+
+	def __init__(self, message: str, status_code: int) -> None:
+		super().__init__(message)
+		self.status_code = status_code
+
+
+# Longest Retry-After we honour; anything longer is capped rather than trusted
+_MAX_RETRY_AFTER_SECONDS = 60.0
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+	"""Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+	if not value:
+		return None
+	value = value.strip()
+	if value.isdigit():
+		seconds = float(value)
+	else:
+		try:
+			seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+		except (TypeError, ValueError):
+			return None
+	return min(max(seconds, 0.0), _MAX_RETRY_AFTER_SECONDS)
+
+
+def _raise_for_status(url: str, status_code: int, headers) -> None:
+	if status_code < 400:
+		return
+	message = f"HTTP {status_code} for {url}"
+	if status_code in (408, 429) or status_code >= 500:
+		raise TransientError(message, _parse_retry_after(headers.get("Retry-After")))
+	raise PermanentError(message, status_code)
+
+
+_backoff = wait_exponential_jitter(initial=1, max=10)
+
+
+def _wait_retry_after(retry_state) -> float:
+	"""Honour the server's Retry-After when it sent one, else back off exponentially."""
+	exc = retry_state.outcome.exception()
+	if isinstance(exc, TransientError) and exc.retry_after is not None:
+		return exc.retry_after
+	return _backoff(retry_state)
+
+
+# Only transient failures are retried; a 404 or 403 fails on the first attempt
+_retry_transient = retry(
+	retry=retry_if_exception_type(TransientError),
+	stop=stop_after_attempt(3),
+	wait=_wait_retry_after,
+	reraise=True,
+)
+
+
+def _cached_page(url: str, ttl_seconds: int) -> HttpResponse | None:
+	if not ttl_seconds:
+		return None
+	cached = load_cached_page(url, ttl_seconds)
+	if cached is None:
+		return None
+	final_url, html = cached
+	return HttpResponse(
+		url=final_url,
+		status_code=200,
+		text=html,
+		content=html.encode("utf-8"),
+		content_type="text/html; charset=utf-8",
+	)
+
+
+class RequestPacer:
+	"""Spaces request starts ``60 / requests_per_minute`` seconds apart.
+
+	One instance is shared by the sync and async clients, across threads and
+	event loops, so REQUESTS_PER_MINUTE holds for the whole crawl.
+	"""
+
+	def __init__(self, requests_per_minute: int) -> None:
+		self.min_interval = 60.0 / max(1, requests_per_minute)
+		self._next_start = 0.0
+		self._lock = threading.Lock()
+
+	def _reserve(self) -> float:
+		# Each caller claims the next start slot under the lock and then waits
+		# for it outside, so concurrent callers queue up instead of bursting
+		with self._lock:
+			now = time.monotonic()
+			start = max(now, self._next_start)
+			self._next_start = start + self.min_interval
+		return start - now
+
+	def wait(self) -> None:
+		delay = self._reserve()
+		if delay > 0:
+			time.sleep(delay)
+
+	async def wait_async(self) -> None:
+		delay = self._reserve()
+		if delay > 0:
+			await asyncio.sleep(delay)
+
+
+request_pacer = RequestPacer(settings.requests_per_minute)
+
+
 class HttpClient:
 	def __init__(self) -> None:
-		# Import settings here to avoid circular imports
-		from .config import settings
-		
 		self.session = requests.Session()
+		# Keep-alive pool sized for the worker threads sharing this client;
+		# tenacity owns retries, so the adapter itself never retries
+		adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+		self.session.mount("https://", adapter)
+		self.session.mount("http://", adapter)
 		self.session.headers.update({
 			"User-Agent": settings.user_agent,
 			"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 		})
-		self.rate_limit_window = 60.0
-		self.max_requests_per_window = max(1, settings.requests_per_minute)
-		self.min_interval = self.rate_limit_window / self.max_requests_per_window
-		self._last_request_time = 0.0
 		self.request_timeout_seconds = settings.request_timeout_seconds
+		self.html_cache_ttl_seconds = settings.html_cache_ttl_seconds
 		
 		self.proxies = {}
 		if settings.http_proxy:
@@ -40,17 +168,21 @@ class HttpClient:
 			self.proxies["https"] = settings.https_proxy
 
 	def _respect_rate_limit(self) -> None:
-		now = time.time()
-		delta = now - self._last_request_time
-		if delta < self.min_interval:
-			time.sleep(self.min_interval - delta)
-		self._last_request_time = time.time()
+		request_pacer.wait()
 
-	@retry(stop=stop_after_attempt(3), wait=wait_exponential_jitter(initial=1, max=10))
+	@_retry_transient
 	def get(self, url: str) -> HttpResponse:
+		cached = _cached_page(url, self.html_cache_ttl_seconds)
+		if cached is not None:
+			return cached
 		self._respect_rate_limit()
-		resp = self.session.get(url, timeout=self.request_timeout_seconds, proxies=self.proxies)
-		resp.raise_for_status()
+		try:
+			resp = self.session.get(url, timeout=self.request_timeout_seconds, proxies=self.proxies)
+		except (requests.ConnectionError, requests.Timeout) as e:
+			raise TransientError(f"{type(e).__name__} for {url}: {e}") from e
+		_raise_for_status(url, resp.status_code, resp.headers)
+		if self.html_cache_ttl_seconds:
+			save_cached_page(url, resp.url, resp.text)
 		return HttpResponse(
 			url=resp.url,
 			status_code=resp.status_code,
@@ -59,21 +191,111 @@ class HttpClient:
 			content_type=resp.headers.get("Content-Type"),
 		)
 
-	@retry(stop=stop_after_attempt(3), wait=wait_exponential_jitter(initial=1, max=10))
-	def download(self, url: str) -> HttpResponse:
+	@_retry_transient
+	def _open_stream(self, url: str) -> requests.Response:
 		self._respect_rate_limit()
-		resp = self.session.get(url, timeout=self.request_timeout_seconds, proxies=self.proxies, stream=True)
-		resp.raise_for_status()
-		content = resp.content
+		try:
+			resp = self.session.get(url, timeout=self.request_timeout_seconds, proxies=self.proxies, stream=True)
+		except (requests.ConnectionError, requests.Timeout) as e:
+			raise TransientError(f"{type(e).__name__} for {url}: {e}") from e
+		try:
+			_raise_for_status(url, resp.status_code, resp.headers)
+		except (TransientError, PermanentError):
+			# Drain the (small) error body so the keep-alive connection goes back
+			# to the pool; an unread streamed response would be dropped instead
+			_ = resp.content
+			raise
+		return resp
+
+	@contextmanager
+	def stream(self, url: str) -> Iterator[tuple[HttpResponse, Iterator[bytes]]]:
+		"""Fetch ``url`` as a stream: yields the response headers and a body chunk iterator."""
+		resp = self._open_stream(url)
+		try:
+			meta = HttpResponse(
+				url=resp.url,
+				status_code=resp.status_code,
+				text="",
+				content=b"",
+				content_type=resp.headers.get("Content-Type"),
+			)
+			yield meta, resp.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+		finally:
+			resp.close()
+
+
+http_client = HttpClient()
+
+
+class AsyncHttpClient:
+	"""Concurrent page fetcher over one HTTP/2 connection pool.
+
+	At most ``max_concurrency`` requests are in flight, and starts are paced by
+	``request_pacer``, the same schedule the sync client uses. The client
+	belongs to the event loop it is used in, so create one per ``asyncio.run``
+	(use ``async with``).
+	"""
+
+	def __init__(self, max_concurrency: int | None = None) -> None:
+		self.max_concurrency = max_concurrency or settings.max_concurrency
+		mounts = {}
+		if settings.http_proxy:
+			mounts["http://"] = httpx.AsyncHTTPTransport(proxy=settings.http_proxy, http2=True)
+		if settings.https_proxy:
+			mounts["https://"] = httpx.AsyncHTTPTransport(proxy=settings.https_proxy, http2=True)
+		self._client = httpx.AsyncClient(
+			http2=True,
+			timeout=settings.request_timeout_seconds,
+			follow_redirects=True,
+			mounts=mounts or None,
+			headers={
+				"User-Agent": settings.user_agent,
+				"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+			},
+		)
+		self._sem = asyncio.Semaphore(self.max_concurrency)
+		self.html_cache_ttl_seconds = settings.html_cache_ttl_seconds
+
+	async def __aenter__(self) -> "AsyncHttpClient":
+		return self
+
+	async def __aexit__(self, *exc) -> None:
+		await self.aclose()
+
+	async def aclose(self) -> None:
+		await self._client.aclose()
+
+	@_retry_transient
+	async def get(self, url: str) -> HttpResponse:
+		cached = _cached_page(url, self.html_cache_ttl_seconds)
+		if cached is not None:
+			return cached
+		async with self._sem:
+			await request_pacer.wait_async()
+			try:
+				resp = await self._client.get(url)
+			except httpx.TransportError as e:
+				raise TransientError(f"{type(e).__name__} for {url}: {e}") from e
+		_raise_for_status(url, resp.status_code, resp.headers)
+		if self.html_cache_ttl_seconds:
+			save_cached_page(url, str(resp.url), resp.text)
 		return HttpResponse(
-			url=resp.url,
+			url=str(resp.url),
 			status_code=resp.status_code,
-			text="",
-			content=content,
+			text=resp.text,
+			content=resp.content,
 			content_type=resp.headers.get("Content-Type"),
 		)
 
+	async def get_many(self, urls: Iterable[str]) -> list[HttpResponse | BaseException]:
+		"""Fetch ``urls`` concurrently; failed fetches are returned in place as exceptions."""
+		return await asyncio.gather(*(self.get(u) for u in urls), return_exceptions=True)
 
-http_client = HttpClient()
 
+def fetch_many(urls: Iterable[str]) -> list[HttpResponse | BaseException]:
+	"""Synchronous entry point: fetch ``urls`` concurrently on a fresh event loop."""
+	async def run() -> list[HttpResponse | BaseException]:
+		async with AsyncHttpClient() as client:
+			return await client.get_many(urls)
 
+	return asyncio.run(run())
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from typing import Iterable, Optional
 
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+from ..config import settings
 
 
 @dataclass
@@ -21,205 +25,254 @@ class CaseParsed:
 	image_links: list[str]
 
 
-def is_listing_page(html: str) -> bool:
-	soup = BeautifulSoup(html, "lxml")
+def _css_class(name: str) -> str:
+	"""XPath predicate equivalent to the CSS class selector ``.name``."""
+	return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _first(xpath: str) -> etree.XPath:
+	"""Compile ``xpath`` to return only its first match in document order (CSS ``select_one``)."""
+	return etree.XPath(f"({xpath})[1]")
+
+
+# Selectors, compiled once at import
+_TEXT_NODES = etree.XPath(
+	"descendant::text()[not(parent::script or parent::style or parent::template)]", smart_strings=False
+)
+_ANCHORS = etree.XPath("//a[@href]")
+_REL_NEXT = "//a[@rel='next']"
+_HAS_REL_NEXT = etree.XPath(f"boolean({_REL_NEXT})")
+_LISTING_ITEMS = etree.XPath(
+	"count(//*[%s])" % " or ".join(_css_class(c) for c in ["result", "results", "list", "search-results", "card"])
+)
+_NEXT_LINK = [
+	_first(_REL_NEXT),
+	_first(f"//a[{_css_class('page-next')}]"),
+	_first(f"//li[{_css_class('next')}]//a"),
+	_first(f"//nav[{_css_class('pagination')}]//a"),
+]
+_TITLE = [_first("//h1"), _first("//h2"), _first(f"//*[{_css_class('title')}]"), _first(f"//*[{_css_class('case-title')}]")]
+_META = {
+	"case_number": [_first(f"//*[{_css_class('case-number')}]"), _first("//*[@id='case-number']")],
+	"court": [_first(f"//*[{_css_class('court')}]")],
+	"parties": [_first(f"//*[{_css_class('parties')}]")],
+	"judges": [_first(f"//*[{_css_class('judges')}]")],
+	"date": [_first(f"//*[{_css_class('date')}]")],
+	"citation": [_first(f"//*[{_css_class('citation')}]")],
+}
+_LABEL_NODES = etree.XPath("//dt | //th | //p | //li")
+_NEXT_DD = etree.XPath("(descendant::dd | following::dd)[1]")
+_NEXT_TD = etree.XPath("(descendant::td | following::td)[1]")
+_CONTENT_CONTAINER = [
+	_first("//main"),
+	_first("//article"),
+	_first(f"//*[{_css_class('content')}]"),
+	_first("//*[@id='content']"),
+	_first(f"//*[{_css_class('judgment-text')}]"),
+	_first(f"//*[{_css_class('case-body')}]"),
+	_first("//*[contains(@class, 'akn')]"),
+	_first(f"//*[{_css_class('document')}]"),
+	_first(f"//*[{_css_class('entry-content')}]"),
+]
+# Non-content blocks (breadcrumbs, nav, sidebars) dropped from the content container
+_CONTENT_NOISE = [
+	etree.XPath(f"descendant::*[{_css_class(sel[1:])}]" if sel.startswith(".") else f"descendant::{sel}")
+	for sel in [
+		".breadcrumbs", ".breadcrumb", "nav", ".nav", ".menu", ".header", "header", ".footer", "footer", "aside", ".sidebar",
+	]
+]
+_CONTENT_TEXT_NODES = etree.XPath(
+	"descendant::*[self::p or self::li or self::pre or self::blockquote or self::h2 or self::h3 or self::h4]"
+)
+
+# Anchor filters: detail-page links by text or path, resources by extension
+_DETAIL_TEXT_RE = re.compile(r"read more|view|case|judgment|ruling", re.I)
+_DETAIL_HREF_RE = re.compile(r"/case|/judgment|/ruling|/download", re.I)
+_PDF_HREF_RE = re.compile(r"\.pdf\Z", re.I)
+_IMAGE_HREF_RE = re.compile(r"\.(?:jpe?g|png|gif)\Z", re.I)
+
+
+def parse_html(html: str) -> etree._Element:
+	"""Parse a page once; the tree can be handed to each of the helpers below."""
+	try:
+		return lxml.html.document_fromstring(html)
+	except ValueError:
+		# str input that still carries an XML encoding declaration
+		return lxml.html.document_fromstring(html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+	except etree.ParserError:
+		# Empty document
+		return lxml.html.document_fromstring("<html></html>")
+
+
+def _text(el: etree._Element, sep: str = " ") -> str:
+	"""Stripped, non-empty text nodes of ``el`` joined by ``sep`` (skips script/style)."""
+	return sep.join(t for t in (s.strip() for s in _TEXT_NODES(el)) if t)
+
+
+def _select_one(tree: etree._Element, xpaths: list[etree.XPath]) -> Optional[etree._Element]:
+	for xpath in xpaths:
+		found = xpath(tree)
+		if found:
+			return found[0]
+	return None
+
+
+def is_listing_page(tree: etree._Element) -> bool:
 	# Heuristic: listing pages have multiple result cards/rows and pagination
-	if soup.select("a[rel='next']"):
+	if _HAS_REL_NEXT(tree):
 		return True
 	# Common listing item containers
-	if len(soup.select(".result, .results, .list, .search-results, .card")) >= 5:
+	if _LISTING_ITEMS(tree) >= 5:
 		return True
 	return False
 
 
-def extract_listing_links(base_url: str, html: str) -> tuple[list[str], Optional[str]]:
+def extract_listing_links(base_url: str, tree: etree._Element) -> tuple[list[str], Optional[str]]:
 	"""Return (detail_links, next_page_url). Both are absolute or relative as found."""
-	soup = BeautifulSoup(html, "lxml")
-	# Detail links: try anchors that look like case detail
+	# Next pagination link from the explicit pagination selectors
+	next_link = None
+	for xpath in _NEXT_LINK:
+		candidate = xpath(tree)
+		if candidate and candidate[0].get("href"):
+			next_link = candidate[0].get("href")
+			break
+
+	# One pass over the anchors: detail links, plus an anchor with text 'Next'
+	# as the pagination fallback
 	detail_links: set[str] = set()
-	for a in soup.find_all("a"):
+	next_fallback = None
+	for a in _ANCHORS(tree):
 		href = a.get("href")
 		if not href:
 			continue
-		text = (a.get_text() or "").lower()
-		if any(k in text for k in ["read more", "view", "case", "judgment", "ruling"]):
-			detail_links.add(href)
-		elif any(k in (href.lower()) for k in ["/case", "/judgment", "/ruling", "/download"]):
+		text = "".join(_TEXT_NODES(a))
+		if _DETAIL_TEXT_RE.search(text) or _DETAIL_HREF_RE.search(href):
 			detail_links.add(href)
+		if next_link is None and next_fallback is None and text.strip().lower() == "next":
+			next_fallback = href
 
-	# Next pagination link
-	next_link = None
-	for sel in ["a[rel='next']", "a.page-next", "li.next a", "nav.pagination a"]:
-		candidate = soup.select_one(sel)
-		if candidate and candidate.get("href"):
-			next_link = candidate["href"]
-			break
-	# Fallback: find an anchor with text 'Next'
-	if not next_link:
-		for a in soup.find_all("a"):
-			if (a.get_text() or "").strip().lower() == "next" and a.get("href"):
-				next_link = a["href"]
-				break
+	return list(detail_links), next_link or next_fallback
 
-	return list(detail_links), next_link
 
+# Label keywords for metadata laid out as "<label> <value>" (dt/dd, th/td) or
+# "<label>: <value>" (p/li); the group name is the CaseParsed field it fills.
+_LABEL_KEYWORDS = {
+	"case_number": ["case number", r"case no\.?"],
+	"court": ["court"],
+	"parties": ["parties", "between", "appellant", "respondent"],
+	"judges": ["judges?", "coram"],
+	"date": ["decision date", "date", "delivered"],
+	"citation": ["citation"],
+	"counsel": ["counsel", "advocates"],
+}
+_LABEL_ALTERNATION = "|".join(f"(?P<{key}>{'|'.join(kws)})" for key, kws in _LABEL_KEYWORDS.items())
+_LABEL_RE = re.compile(_LABEL_ALTERNATION)
+_PREFIX_LABEL_RE = re.compile(f"(?:{_LABEL_ALTERNATION}):")
 
-def _join_text(elements: Iterable) -> str:
+
+def _join_text(elements: Iterable, max_chars: int = 0) -> str:
+	"""Join element texts line by line; with ``max_chars`` stop once that much is collected."""
 	parts: list[str] = []
+	total = 0
 	for el in elements:
-		text = el.get_text(" ", strip=True)
+		text = _text(el)
 		if text:
 			parts.append(text)
+			total += len(text) + 1
+			if max_chars and total > max_chars:
+				return "\n".join(parts)[:max_chars]
 	return "\n".join(parts)
 
 
-def parse_case_detail(url: str, html: str) -> CaseParsed:
-	soup = BeautifulSoup(html, "lxml")
+def parse_case_detail(url: str, tree: etree._Element, max_content_chars: Optional[int] = None) -> CaseParsed:
+	"""Parse a case page; ``content_text`` is capped at ``max_content_chars`` (default: settings).
+
+	Non-content blocks are stripped from ``tree`` in place.
+	"""
+	if max_content_chars is None:
+		max_content_chars = settings.max_content_chars
 
 	# Naive extraction with fallbacks; adjust selectors as we learn the DOM
 	title = None
-	for sel in ["h1", "h2", ".title", ".case-title"]:
-		el = soup.select_one(sel)
-		if el:
-			title = el.get_text(strip=True)
-			break
+	el = _select_one(tree, _TITLE)
+	if el is not None:
+		title = _text(el, "")
+
+	def first_text(selectors: list[etree.XPath]) -> Optional[str]:
+		el = _select_one(tree, selectors)
+		return _text(el) if el is not None else None
 
-	meta_map = {
-		"case_number": [".case-number", "#case-number"],
-		"court": [".court"],
-		"parties": [".parties"],
-		"judges": [".judges"],
-		"date": [".date"],
-		"citation": [".citation"],
-	}
-
-	def first_text(selectors: list[str]) -> Optional[str]:
-		for sel in selectors:
-			el = soup.select_one(sel)
-			if el:
-				return el.get_text(" ", strip=True)
-		return None
-
-	# Generic label-value scraping across common patterns
+	# Generic label-value scraping across common patterns, in one pass over the
+	# label-bearing nodes. Sources keep their precedence: dl, then tables, then p/li.
 	def scan_label_value() -> dict[str, str]:
-		labels = {
-			"case_number": ["case number", "case no", "case no."],
-			"court": ["court"],
-			"parties": ["parties", "between"],
-			"judges": ["judge", "judges", "coram"],
-			"date": ["date", "delivered", "decision date"],
-			"citation": ["citation"],
-			"counsel": ["counsel", "advocates"],
-		}
-		found: dict[str, str] = {}
-		# dl/dt/dd
-		for dl in soup.find_all("dl"):
-			for dt in dl.find_all("dt"):
-				label = (dt.get_text(" ", strip=True) or "").lower()
-				dd = dt.find_next("dd")
-				value = dd.get_text(" ", strip=True) if dd else None
-				if not value:
-					continue
-				for key, kws in labels.items():
-					if any(k in label for k in kws) and key not in found:
-						found[key] = value
-		# tables th/td
-		for table in soup.find_all("table"):
-			for th in table.find_all("th"):
-				label = (th.get_text(" ", strip=True) or "").lower()
-				td = th.find_next("td")
-				value = td.get_text(" ", strip=True) if td else None
-				if not value:
-					continue
-				for key, kws in labels.items():
-					if any(k in label for k in kws) and key not in found:
-						found[key] = value
-		# paragraphs like "Judge: ..." or "Parties: ..."
-		for p in soup.find_all(["p", "li"]):
-			text = (p.get_text(" ", strip=True) or "")
-			low = text.lower()
-			for key, kws in labels.items():
-				for k in kws:
-					if low.startswith(k + ":") and key not in found:
-						found[key] = text.split(":", 1)[1].strip()
-		return found
-
-	# Fallbacks for common label/value layouts
-	def find_label_value(label_keywords: list[str]) -> Optional[str]:
-		for dl in soup.find_all(["dl", "table"]):
-			text = dl.get_text(" ", strip=True).lower()
-			if not any(k in text for k in label_keywords):
+		by_source: tuple[dict[str, str], dict[str, str], dict[str, str]] = ({}, {}, {})
+		for node in _LABEL_NODES(tree):
+			text = _text(node)
+			if node.tag == "p" or node.tag == "li":
+				m = _PREFIX_LABEL_RE.match(text.lower())
+				if m:
+					by_source[2].setdefault(m.lastgroup, text.split(":", 1)[1].strip())
 				continue
-			# Try definition lists
-			for dt in dl.find_all("dt"):
-				label = (dt.get_text(" ", strip=True) or "").lower()
-				if any(k in label for k in label_keywords):
-					dd = dt.find_next("dd")
-					if dd:
-						return dd.get_text(" ", strip=True)
-			# Try tables
-			for th in dl.find_all("th"):
-				label = (th.get_text(" ", strip=True) or "").lower()
-				if any(k in label for k in label_keywords):
-					td = th.find_next("td")
-					if td:
-						return td.get_text(" ", strip=True)
-		return None
+			found = by_source[0] if node.tag == "dt" else by_source[1]
+			keys = {m.lastgroup for m in _LABEL_RE.finditer(text.lower())} - found.keys()
+			if not keys:
+				continue
+			value_el = (_NEXT_DD if node.tag == "dt" else _NEXT_TD)(node)
+			value = _text(value_el[0]) if value_el else None
+			if value:
+				for key in keys:
+					found[key] = value
+		merged: dict[str, str] = {}
+		for found in by_source:
+			for key, value in found.items():
+				merged.setdefault(key, value)
+		return merged
 
 	labels_found = scan_label_value()
-	case_number = first_text(meta_map["case_number"]) or labels_found.get("case_number") or find_label_value(["case number", "case no"]) 
-	court = first_text(meta_map["court"]) or labels_found.get("court") or find_label_value(["court"]) 
-	parties = first_text(meta_map["parties"]) or labels_found.get("parties") or find_label_value(["parties", "appellant", "respondent"]) 
-	judges = first_text(meta_map["judges"]) or labels_found.get("judges") or find_label_value(["judge", "judges", "coram"]) 
-	date = first_text(meta_map["date"]) or labels_found.get("date") or find_label_value(["date", "delivered", "decision date"]) 
-	citation = first_text(meta_map["citation"]) or labels_found.get("citation") or find_label_value(["citation"]) 
+	case_number = first_text(_META["case_number"]) or labels_found.get("case_number")
+	court = first_text(_META["court"]) or labels_found.get("court")
+	parties = first_text(_META["parties"]) or labels_found.get("parties")
+	judges = first_text(_META["judges"]) or labels_found.get("judges")
+	date = first_text(_META["date"]) or labels_found.get("date")
+	citation = first_text(_META["citation"]) or labels_found.get("citation")
 
 	# Content paragraphs (expanded heuristics)
-	content_container = None
-	for sel in [
-		"main",
-		"article",
-		".content",
-		"#content",
-		".judgment-text",
-		".case-body",
-		"[class*='akn']",
-		".document",
-		".entry-content",
-	]:
-		cand = soup.select_one(sel)
-		if cand:
-			content_container = cand
-			break
+	content_container = _select_one(tree, _CONTENT_CONTAINER)
 
 	content_text = None
-	if content_container:
+	if content_container is not None:
 		# remove common non-content blocks (breadcrumbs, nav, sidebars)
-		for rem_sel in [
-			".breadcrumbs", ".breadcrumb", "nav", ".nav", ".menu", ".header", "header", ".footer", "footer", "aside", ".sidebar",
-		]:
-			for el in content_container.select(rem_sel):
-				el.decompose()
+		# (swapped for an empty comment that keeps the tail, so neighbouring text stays separate)
+		for noise in _CONTENT_NOISE:
+			for el in noise(content_container):
+				parent = el.getparent()
+				if parent is not None:
+					marker = etree.Comment()
+					marker.tail = el.tail
+					parent.replace(el, marker)
 		# Prefer rich join across common textual elements
-		text_nodes = content_container.find_all(["p", "li", "pre", "blockquote", "h2", "h3", "h4"]) or []
+		text_nodes = _CONTENT_TEXT_NODES(content_container)
 		if text_nodes:
-			content_text = _join_text(text_nodes)
+			content_text = _join_text(text_nodes, max_content_chars)
 		else:
 			# Fallback: get text of container directly
-			content_text = content_container.get_text("\n", strip=True)
+			content_text = _text(content_container, "\n")
+			if max_content_chars:
+				content_text = content_text[:max_content_chars]
 
 	# Resources
-	pdf_links: list[str] = []
-	image_links: list[str] = []
-	for a in soup.find_all("a"):
+	# Insertion-ordered dicts dedupe as they collect
+	pdf_links: dict[str, None] = {}
+	image_links: dict[str, None] = {}
+	for a in _ANCHORS(tree):
 		href = a.get("href")
 		if not href:
 			continue
-		text = (a.get_text(" ", strip=True) or "").lower()
-		if any(href.lower().endswith(ext) for ext in [".pdf"]) or ("pdf" in text and "download" in text):
-			pdf_links.append(href)
-		elif any(href.lower().endswith(ext) for ext in [".jpg", ".jpeg", ".png", ".gif"]):
-			image_links.append(href)
+		text = _text(a).lower()
+		if _PDF_HREF_RE.search(href) or ("pdf" in text and "download" in text):
+			pdf_links[href] = None
+		elif _IMAGE_HREF_RE.search(href):
+			image_links[href] = None
 
 	return CaseParsed(
 		url=url,
@@ -231,8 +284,8 @@ def parse_case_detail(url: str, html: str) -> CaseParsed:
 		date=date,
 		citation=citation,
 		content_text=content_text,
-		pdf_links=list(dict.fromkeys(pdf_links)),
-		image_links=list(dict.fromkeys(image_links)),
+		pdf_links=list(pdf_links),
+		image_links=list(image_links),
 	)
 
 
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from pypdf import PdfReader
+
+
+# pypdf is pure Python and holds the GIL, so pages are extracted in worker
+# processes. Workers are spawned (not forked) because the parent runs threads.
+_MAX_WORKERS = min(8, os.cpu_count() or 1)
+# Upper bound on one file's extraction; pypdf can spin on malformed PDFs
+_EXTRACT_TIMEOUT_SECONDS = 60
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+	global _pool
+	with _pool_lock:
+		if _pool is None:
+			_pool = ProcessPoolExecutor(max_workers=_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+		return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+	"""Stop ``pool``'s workers and make the next call build a fresh pool."""
+	global _pool
+	with _pool_lock:
+		if _pool is pool:
+			_pool = None
+	# Collect the workers first: shutdown() drops its reference to them, and
+	# shutdown alone would leave a worker stuck on a bad page running
+	processes = list((pool._processes or {}).values())
+	pool.shutdown(wait=False, cancel_futures=True)
+	for process in processes:
+		process.terminate()
+
+
+def _extract_page(path: str, index: int) -> str:
+	# pypdf pages can't be pickled; each worker opens its own reader, which
+	# only parses the xref and the one page it needs
+	return PdfReader(path).pages[index].extract_text() or ""
+
+
+def extract_pdf_text(path: str, max_pages: int = 20) -> str | None:
+	"""Text of the first ``max_pages`` pages of the PDF at ``path``, or None if it has none.
+
+	Raises TimeoutError if the pooled extraction takes longer than 60 seconds.
+	"""
+	reader = PdfReader(path)
+	page_count = min(len(reader.pages), max_pages)
+	texts = None
+	if _MAX_WORKERS > 1:
+		pool = _get_pool()
+		try:
+			texts = list(pool.map(_extract_page, [path] * page_count, range(page_count), timeout=_EXTRACT_TIMEOUT_SECONDS))
+		except TimeoutError:
+			# The worker on the bad page keeps running after map gives up, so
+			# kill the pool rather than let it hold a slot for good
+			_discard_pool(pool)
+			raise
+		except (BrokenProcessPool, CancelledError):
+			# A worker died (OOM on a hostile PDF, spawn failed because the
+			# caller's __main__ lacks an import guard, or another call discarded
+			# the pool); retry in-process below
+			_discard_pool(pool)
+	if texts is None:
+		texts = [page.extract_text() or "" for page in reader.pages[:page_count]]
+	return "\n".join(texts).strip() or None
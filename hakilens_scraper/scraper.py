@@ -1,170 +1,263 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
-
-from .db import Case, Document, Image, get_session, init_db
-from .http_utils import http_client
+from .config import settings
+from .db import Case, Document, Image, LLMCache, get_session, init_db
+from .http_utils import HttpResponse, PermanentError, TransientError, fetch_many, http_client
 from .storage import save_html_snapshot, save_image, save_pdf, save_xml
-from .parsers.kenyalaw import is_listing_page, extract_listing_links, parse_case_detail
+from .parsers.kenyalaw import is_listing_page, extract_listing_links, parse_case_detail, parse_html
 from .akn import extract_plain_text_from_akn
-from pypdf import PdfReader
-from sqlalchemy.exc import IntegrityError, OperationalError
-from tenacity import retry, stop_after_attempt, wait_exponential_jitter
-import threading
+from .pdf import extract_pdf_text
+from sqlalchemy import case, delete, func, insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential_jitter
+
+
+# AKN probes and attachment downloads for a case run here; workers only do
+# network + disk, never touch a DB session. The client's rate limit still paces request starts.
+_download_pool = ThreadPoolExecutor(max_workers=settings.max_concurrency, thread_name_prefix="hakilens-download")
+# crawl_listing stores a page's cases here. Kept apart from _download_pool:
+# these workers block on downloads submitted there, so sharing could deadlock.
+_case_pool = ThreadPoolExecutor(max_workers=settings.max_concurrency, thread_name_prefix="hakilens-case")
+
+
+# Deep scrapes replace case text shorter than this with the first PDF's text
+_SHORT_TEXT_CHARS = 800
 
 
+# The same (page, href) pairs recur across a crawl's listing pages and re-crawls
+@lru_cache(maxsize=16384)
 def normalize_url(base: str, href: str) -> str:
 	return urljoin(base, href)
 
 
-_transaction_lock = threading.RLock()
+# Both dialects support INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential_jitter(initial=0.5, max=2))
-def scrape_case_detail(url: str, deep: bool = False) -> int:
-	resp = http_client.get(url)
+
+def _upsert_case(session: Session, url: str, values: dict) -> int:
+	"""Insert or update the case stored under ``url`` with a single upsert; returns its id.
+
+	Bypasses the ORM, so it does what ``invalidate_case_llm_cache`` does for ORM
+	writes: new ``content_text`` clears the stored summary and cached LLM answers.
+	"""
+	columns = Case.__table__.c
+	# RETURNING only sees the new row, so drop the cached answers up front (same
+	# transaction) when this scrape replaces the stored text of an existing case
+	changed_case_id = (
+		select(columns.id)
+		.where(columns.url == url, columns.content_text.is_distinct_from(values["content_text"]))
+		.scalar_subquery()
+	)
+	session.execute(delete(LLMCache).where(LLMCache.case_id == changed_case_id))
+
+	dialect_insert = _UPSERT_INSERTS[session.get_bind().dialect.name]
+	stmt = dialect_insert(Case).values(url=url, **values)
+	stmt = stmt.on_conflict_do_update(
+		index_elements=[columns.url],
+		set_={
+			**{k: stmt.excluded[k] for k in values},
+			"summary": case(
+				(columns.content_text.is_distinct_from(stmt.excluded.content_text), None),
+				else_=columns.summary,
+			),
+			"updated_at": datetime.utcnow(),
+		},
+		# An unchanged re-scrape leaves the row (and its FTS entry) alone
+		where=or_(*(columns[k].is_distinct_from(stmt.excluded[k]) for k in values)),
+	).returning(columns.id)
+	case_id = session.execute(stmt).scalar_one_or_none()
+	if case_id is None:
+		# Nothing changed, so RETURNING had no row
+		case_id = session.execute(select(Case.id).where(Case.url == url)).scalar_one()
+	return case_id
+
+
+def _stored_case_ids(urls: list[str], deep: bool) -> dict[str, int]:
+	"""URL -> id of the already-stored cases among ``urls`` that re-scraping would not improve."""
+	if not urls:
+		return {}
+	init_db()
+	min_chars = _SHORT_TEXT_CHARS if deep else 1
+	stmt = select(Case.url, Case.id).where(Case.url.in_(urls), func.length(Case.content_text) >= min_chars)
+	with get_session() as session:
+		return dict(session.execute(stmt).all())
+
+
+def _akn_candidates(url: str) -> list[str]:
+	"""Plausible Akoma Ntoso XML locations for a case URL containing /eng@."""
+	if "/eng@" not in url:
+		return []
+	base = url.split("/eng@", 1)[0]
+	return [
+		f"{base}/eng@/main.xml",
+		f"{base}/eng@/main",
+		f"{base}/eng@.xml",
+		f"{base}/eng@/document.xml",
+	]
+
+
+def _fetch_akn_text(xml_url: str) -> str | None:
+	try:
+		with http_client.stream(xml_url) as (xml_resp, chunks):
+			# Decide on the headers: a non-XML answer (usually the HTML page)
+			# is dropped before its body is downloaded
+			if (xml_resp.content_type or "").lower().find("xml") == -1 and not xml_url.endswith(".xml"):
+				return None
+			content = b"".join(chunks)
+		if not content:
+			return None
+		save_xml(xml_url, content)
+		return extract_plain_text_from_akn(content)
+	except Exception:
+		return None
+
+
+def _fetch_and_save_pdf(url: str) -> tuple[str, str, str | None] | None:
+	try:
+		with http_client.stream(url) as (resp, chunks):
+			path = save_pdf(url, chunks, resp.content_type)
+	except Exception:
+		return None
+	return url, str(path), resp.content_type
+
+
+def _fetch_and_save_image(url: str) -> tuple[str, str] | None:
+	try:
+		with http_client.stream(url) as (resp, chunks):
+			path = save_image(url, chunks, resp.content_type)
+	except Exception:
+		return None
+	return url, str(path)
+
+
+# Retries cover DB contention; HTTP failures were already retried (or judged
+# permanent) by the client, so re-fetching here would only burn rate budget
+@retry(
+	retry=retry_if_not_exception_type((PermanentError, TransientError)),
+	stop=stop_after_attempt(3),
+	wait=wait_exponential_jitter(initial=0.5, max=2),
+)
+def scrape_case_detail(url: str, deep: bool = False, resp: HttpResponse | None = None, tree=None) -> int:
+	"""Scrape and store one case; ``resp`` (and its parsed ``tree``) is an already-fetched copy of ``url``.
+
+	Without ``resp``, a case already stored with its text is returned without refetching.
+	"""
+	if resp is None:
+		stored = _stored_case_ids([url], deep)
+		if url in stored:
+			return stored[url]
+		resp = http_client.get(url)
+		tree = None
 	save_html_snapshot(resp.url, resp.text)
-	parsed = parse_case_detail(resp.url, resp.text)
+	parsed = parse_case_detail(resp.url, tree if tree is not None else parse_html(resp.text))
 
 	init_db()
-	# Serialize the entire DB transaction to avoid SQLite write contention
-	with _transaction_lock, get_session() as session:
-		existing = session.query(Case).filter(Case.url == parsed.url).one_or_none()
-		if existing:
-			case = existing
-		else:
-			case = Case(url=parsed.url)
-			session.add(case)
-			from .db import db_write_lock
-			with db_write_lock:
-				try:
-					session.flush()
-				except IntegrityError:
-					# Another concurrent request inserted the same URL; fetch it
-					session.rollback()
-					case = session.query(Case).filter(Case.url == parsed.url).one()
-				except OperationalError:
-					# SQLite locked, let retry handle
-					session.rollback()
-					raise
-
-		case.title = parsed.title
-		case.case_number = parsed.case_number
-		case.court = parsed.court
-		case.parties = parsed.parties
-		case.judges = parsed.judges
-		case.date = parsed.date
-		case.citation = parsed.citation
-		case.content_text = parsed.content_text
-		from .db import db_write_lock
-		with db_write_lock:
-			try:
-				session.flush()
-				session.commit()
-			except OperationalError:
-				session.rollback()
-				raise
 
-		# Attempt Akoma Ntoso XML if discoverable by replacing /eng@ with plausible XML paths
-		try:
-			if "/eng@" in parsed.url:
-				base = parsed.url.split("/eng@", 1)[0]
-				candidates = [
-					f"{base}/eng@/main.xml",
-					f"{base}/eng@/main",
-					f"{base}/eng@.xml",
-					f"{base}/eng@/document.xml",
-				]
-				akn_text: str | None = None
-				for xml_url in candidates:
-					try:
-						xml_resp = http_client.download(xml_url)
-						if not xml_resp.content:
-							continue
-						if (xml_resp.content_type or "").lower().find("xml") == -1 and not xml_url.endswith(".xml"):
-							continue
-						path = save_xml(xml_url, xml_resp.content)
-						text_candidate = extract_plain_text_from_akn(xml_resp.content)
-						if text_candidate and len(text_candidate) > (len(akn_text or "")):
-							akn_text = text_candidate
-					except Exception:
-						continue
-				if akn_text and (not parsed.content_text or len(parsed.content_text or "") < len(akn_text)):
-					parsed.content_text = akn_text
-					# Also persist immediately to the case
-					case.content_text = akn_text
-					from .db import db_write_lock
-					with db_write_lock:
-						session.flush()
-						session.commit()
-		except Exception:
-			pass
+	# Do all network work before touching the DB, so the write transaction
+	# below only spans the inserts and commits once per case. AKN XML probes
+	# (the /eng@ candidates), PDFs and images are all fetched concurrently.
+	akn_futures = [_download_pool.submit(_fetch_akn_text, xml_url) for xml_url in _akn_candidates(parsed.url)]
+	pdf_futures = [_download_pool.submit(_fetch_and_save_pdf, normalize_url(parsed.url, link)) for link in parsed.pdf_links]
+	image_futures = [_download_pool.submit(_fetch_and_save_image, normalize_url(parsed.url, link)) for link in parsed.image_links]
 
-		first_pdf_text: str | None = None
-		# Download PDFs
-		for link in parsed.pdf_links:
-			abs_url = normalize_url(parsed.url, link)
-			try:
-				pdf_resp = http_client.download(abs_url)
-				path = save_pdf(abs_url, pdf_resp.content, pdf_resp.content_type)
-				doc = Document(case_id=case.id, file_path=str(path), url=abs_url, content_type=pdf_resp.content_type)
-				session.add(doc)
-				from .db import db_write_lock
-				with db_write_lock:
-					session.flush()
-					session.commit()
-				if first_pdf_text is None and deep:
-					try:
-						reader = PdfReader(str(path))
-						text_parts = []
-						for page in reader.pages[:20]:
-							text_parts.append(page.extract_text() or "")
-						first_pdf_text = "\n".join(text_parts).strip() or None
-					except Exception:
-						pass
-			except Exception:
-				continue
+	content_text = parsed.content_text
+	akn_text: str | None = None
+	for fut in akn_futures:
+		text_candidate = fut.result()
+		if text_candidate and len(text_candidate) > (len(akn_text or "")):
+			akn_text = text_candidate
+	if akn_text and (not content_text or len(content_text or "") < len(akn_text)):
+		content_text = akn_text
 
-		# Download images
-		for link in parsed.image_links:
-			abs_url = normalize_url(parsed.url, link)
+	pdf_rows = [row for row in (f.result() for f in pdf_futures) if row]
+	image_rows = [row for row in (f.result() for f in image_futures) if row]
+
+	first_pdf_text: str | None = None
+	if deep:
+		for _, path, _ in pdf_rows:
 			try:
-				img_resp = http_client.download(abs_url)
-				path = save_image(abs_url, img_resp.content, img_resp.content_type)
-				img = Image(case_id=case.id, file_path=str(path), url=abs_url)
-				session.add(img)
-				from .db import db_write_lock
-				with db_write_lock:
-					session.flush()
-					session.commit()
+				first_pdf_text = extract_pdf_text(path, max_pages=20)
 			except Exception:
-				continue
+				pass
+			if first_pdf_text is not None:
+				break
 
-		# Fill content_text if still small and we have PDF text
-		if deep and (not case.content_text or len(case.content_text) < 800) and first_pdf_text:
-			case.content_text = first_pdf_text
-			from .db import db_write_lock
-			with db_write_lock:
-				session.flush()
-				session.commit()
+	# Fill content_text if still small and we have PDF text
+	if deep and (not content_text or len(content_text) < _SHORT_TEXT_CHARS) and first_pdf_text:
+		content_text = first_pdf_text
 
-		return case.id
+	# No Python-level lock: SQLite (WAL + busy_timeout) queues concurrent writers,
+	# and a lock timeout surfaces as OperationalError for the retry above
+	with get_session() as session:
+		case_id = _upsert_case(session, parsed.url, {
+			"title": parsed.title,
+			"case_number": parsed.case_number,
+			"court": parsed.court,
+			"parties": parsed.parties,
+			"judges": parsed.judges,
+			"date": parsed.date,
+			"citation": parsed.citation,
+			"content_text": content_text,
+		})
+		# One executemany per table instead of an ORM object per attachment
+		if pdf_rows:
+			session.execute(insert(Document), [
+				{"case_id": case_id, "file_path": file_path, "url": abs_url, "content_type": content_type}
+				for abs_url, file_path, content_type in pdf_rows
+			])
+		if image_rows:
+			session.execute(insert(Image), [
+				{"case_id": case_id, "file_path": file_path, "url": abs_url}
+				for abs_url, file_path in image_rows
+			])
+		# get_session commits once on exit
+		return case_id
 
 
-def crawl_listing(start_url: str, max_pages: int | None = None, deep: bool = False) -> list[int]:
+def crawl_listing(
+	start_url: str,
+	max_pages: int | None = None,
+	deep: bool = False,
+	resp: HttpResponse | None = None,
+	tree=None,
+) -> list[int]:
+	"""Crawl a listing and its pagination; ``resp``/``tree`` are an already-fetched first page."""
 	ids: list[int] = []
 	page_count = 0
 	current_url = start_url
 	while current_url:
-		resp = http_client.get(current_url)
-		save_html_snapshot(resp.url, resp.text)
-		links, next_link = extract_listing_links(resp.url, resp.text)
-		for href in links:
-			case_url = normalize_url(resp.url, href)
+		if resp is None:
+			resp = http_client.get(current_url)
+			save_html_snapshot(resp.url, resp.text)
+			tree = None
+		links, next_link = extract_listing_links(resp.url, tree if tree is not None else parse_html(resp.text))
+		case_urls = [normalize_url(resp.url, href) for href in links]
+		# Cases already stored with their text are not refetched on re-crawls
+		stored = _stored_case_ids(case_urls, deep)
+		new_urls = list(dict.fromkeys(u for u in case_urls if u not in stored))
+		# Fetch the page's remaining detail pages concurrently, then parse/store
+		# several cases at once so their attachment downloads overlap
+		pages = dict(zip(new_urls, fetch_many(new_urls))) if new_urls else {}
+		futures = {
+			case_url: _case_pool.submit(scrape_case_detail, case_url, deep=deep, resp=page)
+			for case_url, page in pages.items()
+			if not isinstance(page, BaseException)
+		}
+		for case_url in case_urls:
+			if case_url in stored:
+				ids.append(stored[case_url])
+				continue
+			if case_url not in futures:
+				continue
 			try:
-				case_id = scrape_case_detail(case_url, deep=deep)
-				ids.append(case_id)
+				ids.append(futures[case_url].result())
 			except Exception:
 				continue
 
@@ -172,6 +265,7 @@ def crawl_listing(start_url: str, max_pages: int | None = None, deep: bool = Fal
 		if max_pages and page_count >= max_pages:
 			break
 		current_url = normalize_url(resp.url, next_link) if next_link else None
+		resp = tree = None
 
 	return ids
 
@@ -179,10 +273,12 @@ def crawl_listing(start_url: str, max_pages: int | None = None, deep: bool = Fal
 def scrape_url(url: str, deep: bool = False) -> list[int]:
 	resp = http_client.get(url)
 	save_html_snapshot(resp.url, resp.text)
-	if is_listing_page(resp.text):
-		return crawl_listing(resp.url, deep=deep)
+	# Parse once and hand the page on instead of fetching it again
+	tree = parse_html(resp.text)
+	if is_listing_page(tree):
+		return crawl_listing(resp.url, deep=deep, resp=resp, tree=tree)
 	else:
-		return [scrape_case_detail(resp.url, deep=deep)]
+		return [scrape_case_detail(resp.url, deep=deep, resp=resp, tree=tree)]
 
 
 def search_and_scrape(query: str, start_url: str = "https://new.kenyalaw.org/judgments/", deep: bool = False) -> list[int]:
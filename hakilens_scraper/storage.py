@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import gzip
 import hashlib
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 from .config import settings
 
@@ -11,16 +15,69 @@ def _sha1(text: str) -> str:
 	return hashlib.sha1(text.encode("utf-8")).hexdigest()
 
 
+def _write_chunks(path: Path, chunks: Iterable[bytes]) -> Path:
+	# Stream into a temp file and swap it in atomically, so readers never see
+	# a half-written file and a download that fails midway leaves nothing behind
+	tmp = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+	try:
+		with tmp.open("wb") as f:
+			for chunk in chunks:
+				f.write(chunk)
+		os.replace(tmp, path)
+	except BaseException:
+		tmp.unlink(missing_ok=True)
+		raise
+	return path
+
+
 def save_html_snapshot(url: str, html: str) -> Path:
 	filename = f"{_sha1(url)}.html"
 	path = settings.html_dir / filename
-	path.write_text(html, encoding="utf-8")
+	data = html.encode("utf-8")
+	# Re-crawls mostly refetch unchanged pages: leave an identical snapshot alone
+	# (comparing is a read, cheaper than a rewrite and its metadata update)
+	try:
+		if path.stat().st_size == len(data) and path.read_bytes() == data:
+			return path
+	except OSError:
+		pass
+	path.write_bytes(data)
 	return path
 
 
+def load_cached_page(url: str, max_age_seconds: float) -> Optional[tuple[str, str]]:
+	"""Return (final_url, html) cached for ``url`` if written less than ``max_age_seconds`` ago."""
+	path = settings.html_cache_dir / f"{_sha1(url)}.html.gz"
+	try:
+		if time.time() - path.stat().st_mtime > max_age_seconds:
+			return None
+		final_url, _, html = gzip.decompress(path.read_bytes()).decode("utf-8").partition("\n")
+	except (OSError, EOFError, UnicodeDecodeError):
+		return None
+	return final_url, html
+
+
+def save_cached_page(url: str, final_url: str, html: str) -> Path:
+	"""Cache a fetched page (gzip, final URL on the first line) under the requested URL."""
+	path = settings.html_cache_dir / f"{_sha1(url)}.html.gz"
+	return _write_chunks(path, [gzip.compress(f"{final_url}\n{html}".encode("utf-8"), compresslevel=6)])
+
+
+_EXT_BY_MEDIA_TYPE = {
+	"application/pdf": ".pdf",
+	"image/jpeg": ".jpg",
+	"image/png": ".png",
+	"image/gif": ".gif",
+}
+
+
 def _ext_from_content_type(content_type: Optional[str], default: str) -> str:
 	if not content_type:
 		return default
+	ext = _EXT_BY_MEDIA_TYPE.get(content_type.partition(";")[0].strip().lower())
+	if ext:
+		return ext
+	# Non-canonical spellings such as application/x-pdf or image/jpg
 	if "pdf" in content_type:
 		return ".pdf"
 	if "jpeg" in content_type or "jpg" in content_type:
@@ -32,18 +89,14 @@ def _ext_from_content_type(content_type: Optional[str], default: str) -> str:
 	return default
 
 
-def save_pdf(url: str, content: bytes, content_type: Optional[str]) -> Path:
+def save_pdf(url: str, chunks: Iterable[bytes], content_type: Optional[str]) -> Path:
 	filename = f"{_sha1(url)}{_ext_from_content_type(content_type, '.pdf')}"
-	path = settings.pdf_dir / filename
-	path.write_bytes(content)
-	return path
+	return _write_chunks(settings.pdf_dir / filename, chunks)
 
 
-def save_image(url: str, content: bytes, content_type: Optional[str]) -> Path:
+def save_image(url: str, chunks: Iterable[bytes], content_type: Optional[str]) -> Path:
 	filename = f"{_sha1(url)}{_ext_from_content_type(content_type, '.img')}"
-	path = settings.image_dir / filename
-	path.write_bytes(content)
-	return path
+	return _write_chunks(settings.image_dir / filename, chunks)
 
 
 def save_xml(url: str, content: bytes) -> Path:
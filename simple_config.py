@@ -7,4 +7,3 @@ class Settings:
         self.database_url = os.getenv("DATABASE_URL", "sqlite:///data/hakilens.db")
 
 settings = Settings()
-print("Settings created successfully")
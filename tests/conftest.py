@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Run against this checkout without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings are read at import time: point storage and the database at a
+# throwaway directory before any test imports hakilens_scraper
+_tmp = tempfile.mkdtemp(prefix="hakilens-tests-")
+os.environ["STORAGE_DIR"] = _tmp
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/hakilens.db"
@@ -0,0 +1,23 @@
+from hakilens_scraper.akn import extract_plain_text_from_akn
+
+
+AKN_NS = 'xmlns="http://docs.oasis-open.org/legaldocml/ns/akn/3.0"'
+
+
+def test_nested_body_is_read_once_with_its_outer_body():
+	xml = (
+		f"<akomaNtoso {AKN_NS}><judgment><body>"
+		"<p>outer a</p><body><p>inner</p></body><p>outer b</p>"
+		"</body></judgment></akomaNtoso>"
+	)
+	assert extract_plain_text_from_akn(xml.encode()) == "outer a\ninner\nouter b"
+
+
+def test_text_of_every_top_level_body_is_joined():
+	xml = (
+		f"<akomaNtoso {AKN_NS}>"
+		"<doc><body><p>first</p></body></doc>"
+		"<doc><body><p>second</p></body></doc>"
+		"</akomaNtoso>"
+	)
+	assert extract_plain_text_from_akn(xml.encode()) == "first\nsecond"
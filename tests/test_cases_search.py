@@ -0,0 +1,16 @@
+from fastapi.testclient import TestClient
+
+from hakilens_scraper.api import app
+from hakilens_scraper.db import Case, fts_enabled, get_session, init_db
+
+
+def test_case_number_matches_on_substring():
+	init_db()
+	assert fts_enabled()
+	with get_session() as session:
+		session.add(Case(url="https://example.test/cases/e123", title="Republic v Otieno", case_number="E123/2020"))
+
+	resp = TestClient(app).get("/cases", params={"q": "123"})
+
+	assert resp.status_code == 200
+	assert [item["case_number"] for item in resp.json()["items"]] == ["E123/2020"]
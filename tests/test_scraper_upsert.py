@@ -0,0 +1,56 @@
+from hakilens_scraper.db import Case, LLMCache, get_session, init_db
+from hakilens_scraper.scraper import _upsert_case
+
+
+URL = "https://example.test/cases/upsert"
+
+
+def _values(content_text: str) -> dict:
+	return {
+		"title": "A v B",
+		"case_number": "E1/2020",
+		"court": "High Court",
+		"parties": None,
+		"judges": None,
+		"date": None,
+		"citation": None,
+		"content_text": content_text,
+	}
+
+
+def _summary_and_cache_rows(case_id: int) -> tuple[str | None, int]:
+	with get_session() as session:
+		summary = session.get(Case, case_id).summary
+		return summary, session.query(LLMCache).filter(LLMCache.case_id == case_id).count()
+
+
+def _summarize(case_id: int) -> None:
+	with get_session() as session:
+		session.get(Case, case_id).summary = "SUMMARY OF OLD"
+		session.add(LLMCache(hash=case_id.to_bytes(32, "big"), case_id=case_id, response="cached answer"))
+
+
+def test_rescrape_with_same_text_keeps_summary_and_llm_cache():
+	init_db()
+	with get_session() as session:
+		case_id = _upsert_case(session, URL + "/same", _values("old text"))
+	_summarize(case_id)
+
+	with get_session() as session:
+		assert _upsert_case(session, URL + "/same", _values("old text")) == case_id
+
+	assert _summary_and_cache_rows(case_id) == ("SUMMARY OF OLD", 1)
+
+
+def test_rescrape_with_changed_text_clears_summary_and_llm_cache():
+	init_db()
+	with get_session() as session:
+		case_id = _upsert_case(session, URL, _values("old text"))
+	_summarize(case_id)
+
+	with get_session() as session:
+		assert _upsert_case(session, URL, _values("new text")) == case_id
+
+	assert _summary_and_cache_rows(case_id) == (None, 0)
+	with get_session() as session:
+		assert session.get(Case, case_id).content_text == "new text"
@@ -0,0 +1,51 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from hakilens_scraper import api
+
+
+class _FakeCompletions:
+	def __init__(self, deltas, gap):
+		self.deltas = deltas
+		self.gap = gap
+
+	async def create(self, **kwargs):
+		return self._stream()
+
+	async def _stream(self):
+		for delta in self.deltas:
+			await asyncio.sleep(self.gap)
+			yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+
+def _fake_client(deltas, gap):
+	return SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions(deltas, gap)))
+
+
+async def _collect(client):
+	return [delta async for delta in api.stream_completion("openai", client, "model", [])]
+
+
+def test_long_stream_is_not_cut_off_by_the_call_timeout(monkeypatch):
+	monkeypatch.setattr(api._llm_settings, "llm_timeout_seconds", 0.2)
+	free_slots = api.LLM_SEM._value
+
+	# Five chunks 0.1s apart outlast the timeout overall but never stall past it
+	deltas = asyncio.run(_collect(_fake_client(["a", "b", "c", "d", "e"], 0.1)))
+
+	assert deltas == ["a", "b", "c", "d", "e"]
+	assert api.LLM_SEM._value == free_slots
+
+
+def test_stalled_stream_times_out_and_frees_the_slot(monkeypatch):
+	monkeypatch.setattr(api._llm_settings, "llm_timeout_seconds", 0.2)
+	free_slots = api.LLM_SEM._value
+
+	with pytest.raises(HTTPException) as excinfo:
+		asyncio.run(_collect(_fake_client(["a"], 0.5)))
+
+	assert excinfo.value.status_code == 504
+	assert api.LLM_SEM._value == free_slots